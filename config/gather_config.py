@@ -1 +1,38 @@
+from config.unzip_cinfig import log_dir
+
 COMPRESS = {'zip', 'sevenzip', 'rar', 'tar', "iso", "cab", "jpeg"}
+
+# FileGather 并行遍历的默认线程数，1 表示单线程递归遍历
+GATHER_WORKERS = 1
+
+# 分卷集合最多记录的缺失分卷数，序号跳跃很大时避免生成海量文件名
+VOLUME_MAX_MISSING = 100
+
+# Magika 批量识别文件类型时每批的文件数
+IDENTIFY_BATCH_SIZE = 64
+
+# 持久化文件类型缓存路径，设为 None 关闭缓存
+TYPE_CACHE_FILE = log_dir / "filetype_cache.sqlite"
+# 文件类型缓存的最大记录数
+TYPE_CACHE_MAX_ENTRIES = 200_000
+
+# 流式收集时队列已满的等待间隔（秒），每次超时后检查停止标志
+STREAM_PUT_TIMEOUT = 0.5
+
+# 监听模式下文件大小保持不变多少秒后视为写入完成
+WATCH_STABLE_SECONDS = 5.0
+# 监听模式的轮询间隔（秒）
+WATCH_POLL_INTERVAL = 1.0
+
+# 异步收集器同时进行的目录读取数上限
+ASYNC_MAX_CONCURRENT_DIRS = 16
+# 异步收集器结果队列容量
+ASYNC_QUEUE_SIZE = 64
+
+# 持久化文件哈希缓存路径，设为 None 关闭缓存
+HASH_CACHE_FILE = log_dir / "hash_cache.sqlite"
+# 去重时读取文件首尾块的大小（字节）
+DEDUP_BLOCK_SIZE = 64 * 1024
+
+# 压缩包内容索引的数据库路径
+ARCHIVE_INDEX_FILE = log_dir / "archive_index.sqlite"
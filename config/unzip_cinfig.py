@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 # 获取项目根目录的路径
@@ -10,3 +11,55 @@ path_test = Path(r"..\..\log\unzip.7z").resolve()
 log_dir = log_file.parent
 if not log_dir.exists():
     log_dir.mkdir(parents=True, exist_ok=True)
+
+# 流式执行时保留的输出行数，用于报错
+STREAM_TAIL_LINES = 200
+
+# 进程内解压时并行解压成员的线程数
+PY_EXTRACT_WORKERS = 4
+# 成员数少于该值时不启用线程池，避免大量小压缩包的线程开销
+PY_EXTRACT_PARALLEL_MIN_MEMBERS = 8
+
+# 压缩软件探测结果的持久化缓存路径，设为 None 关闭磁盘缓存
+TOOL_CACHE_FILE = log_dir / "tool_cache.json"
+# 探测压缩软件时的超时时间（秒）
+TOOL_PROBE_TIMEOUT = 10
+
+# 按压缩包类型选择解压后端的默认优先级，类型名与 config.gather_config.COMPRESS 一致，依次选择第一个可用的后端
+BACKEND_ROUTES = {
+    "zip": ["python", "7z", "bandizip", "winrar"],
+    "sevenzip": ["7z", "bandizip", "winrar", "python"],
+    "tar": ["7z", "python", "bandizip", "winrar"],
+    "rar": ["7z", "winrar", "bandizip"],
+    "iso": ["7z", "bandizip", "winrar"],
+    "cab": ["7z", "bandizip", "winrar"],
+}
+# 校准结果的保存路径，存在时覆盖默认优先级
+BACKEND_ROUTE_FILE = log_dir / "backend_routes.json"
+
+# 解压前预检磁盘空间时额外保留的比例与字节数，取两者中较大的值
+DISK_SAFETY_RATIO = 0.05
+DISK_SAFETY_BYTES = 256 * 1024 * 1024
+# 并行读取压缩包成员列表的线程数
+PREFLIGHT_WORKERS = 2
+
+# 解压时包含/排除的通配符超过该数量时写入列表文件传给软件，避免命令行过长
+MASK_LIST_THRESHOLD = 16
+# 压缩的输入文件超过该数量时写入列表文件传给软件，单个进程即可压缩任意数量的文件
+INPUT_LIST_THRESHOLD = 16
+# 命令行总长度上限（Windows 为 32767 个字符），不支持列表文件的软件超过时报错
+COMMAND_LINE_LIMIT = 32000
+
+# 嵌套解压的最大层级，0 表示只解压直接提交的压缩包
+RECURSIVE_MAX_DEPTH = 3
+# 解压后大小与压缩包大小之比超过该值时视为压缩炸弹，不再解压
+BOMB_MAX_RATIO = 100
+# 一条嵌套链解压出的总大小上限（字节），None 表示不限制
+BOMB_MAX_TOTAL_BYTES = None
+
+# 压缩预设，键与 CompressionPreset 的值一致，字段与 ToolConfig 的压缩参数一致，None 表示使用软件默认值
+COMPRESSION_PRESETS = {
+    "fastest": {"level": 1, "threads": os.cpu_count(), "dictionary": "1m", "solid_block": "off", "method": None},
+    "balanced": {"level": 5, "threads": os.cpu_count(), "dictionary": None, "solid_block": "1g", "method": None},
+    "smallest": {"level": 9, "threads": os.cpu_count(), "dictionary": "128m", "solid_block": "on", "method": None},
+}
@@ -0,0 +1,103 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from queue import Queue
+from typing import AsyncIterator, Optional, Union
+
+from config.gather_config import ASYNC_MAX_CONCURRENT_DIRS, ASYNC_QUEUE_SIZE, COMPRESS
+from src.core.implement.gather.file_gather import FileGather
+from src.core.interfaces.gather_interfaces import END_OF_STREAM
+from src.enumerate.gather_enum import Mode
+
+
+class AsyncFileGather(FileGather):
+    """
+    asyncio 原生收集器，用法: async for group in gatherer.collect()。
+    目录读取与文件类型识别在有界线程池中执行，通过取消任务终止收集。
+    """
+
+    def __init__(self, path: Optional[Union[Path, str]] = None, types: set = COMPRESS, max_workers: int = 4,
+                 max_concurrent_dirs: int = ASYNC_MAX_CONCURRENT_DIRS, queue_size: int = ASYNC_QUEUE_SIZE):
+        super().__init__(Queue(), path, types, max_workers)
+        self.max_concurrent_dirs = max_concurrent_dirs
+        self.queue_size = queue_size
+
+    async def collect(self) -> AsyncIterator:
+        """异步产出分组，消费方取消任务或提前退出时终止遍历"""
+        target_path: Path = self.get_path()
+        if target_path is None:
+            raise ValueError("文件路径未设置")
+        self.incomplete_sets = []
+
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="AsyncFileGather")
+        results: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        dir_semaphore = asyncio.Semaphore(self.max_concurrent_dirs)
+
+        async def produce():
+            try:
+                if target_path.is_file():
+                    file_type = await loop.run_in_executor(executor, self.get_type_name, target_path)
+                    if file_type in self.type:
+                        await results.put((target_path, file_type))
+                elif target_path.is_dir():
+                    await self._walk(target_path, loop, executor, results, dir_semaphore)
+            except Exception:
+                # 取消时不放入哨兵，避免消费方已退出时阻塞在已满的队列上
+                await results.put(END_OF_STREAM)
+                raise
+            await results.put(END_OF_STREAM)
+
+        producer = asyncio.create_task(produce())
+        try:
+            while True:
+                item = await results.get()
+                if item is END_OF_STREAM:
+                    break
+                yield item
+            await producer  # 抛出遍历过程中的异常
+        finally:
+            if not producer.done():
+                producer.cancel()
+                try:
+                    await producer
+                except asyncio.CancelledError:
+                    pass
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _walk(self, directory: Path, loop: asyncio.AbstractEventLoop, executor: ThreadPoolExecutor,
+                    results: asyncio.Queue, dir_semaphore: asyncio.Semaphore) -> None:
+        """递归遍历目录，子目录并发处理"""
+        try:
+            async with dir_semaphore:
+                scan = await loop.run_in_executor(executor, self.scan_directory, directory)
+        except ValueError as e:
+            self.log.info(f"跳过无效目录: {e}")
+            return
+
+        if scan.mode == Mode.DIR:
+            children = [
+                asyncio.create_task(self._walk(Path(entry.path), loop, executor, results, dir_semaphore))
+                for entry in scan.dirs
+            ]
+            try:
+                await asyncio.gather(*children)
+            finally:
+                # 某个子目录出错时 gather 不会取消其它子任务，需取消并等待其结束，避免遗留任务
+                for child in children:
+                    child.cancel()
+                await asyncio.gather(*children, return_exceptions=True)
+        elif scan.mode == Mode.FILE:
+            groups = await loop.run_in_executor(executor, self._group_files, scan)
+            for group in groups:
+                await results.put(group)
+                self.log.info(f"分组产出: {[f[0].name for f in group]}")
+
+
+if __name__ == '__main__':
+    async def main():
+        gatherer = AsyncFileGather(r"E:\下载文件\百度网盘下载文件\15")
+        async for group in gatherer.collect():
+            print(group)
+
+    asyncio.run(main())
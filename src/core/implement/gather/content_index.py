@@ -0,0 +1,119 @@
+"""
+压缩包内容索引：记录 FileGather 找到的每个压缩包的成员列表，无需解压即可按通配符或大小搜索。
+
+用法:
+    python -m src.core.implement.gather.content_index index E:\\下载文件
+    python -m src.core.implement.gather.content_index search "*.psd" --name-only --min-size 1048576
+"""
+import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from queue import Queue
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from config.gather_config import ARCHIVE_INDEX_FILE
+from config.unzip_cinfig import PREFLIGHT_WORKERS, log_file
+from src.core.implement.gather.file_gather import FileGather
+from src.core.implement.unzip.ArchiveLister import ArchiveLister
+from src.exceptions.unzip_excepotion import CompressionError
+from src.utils.ArchiveIndex import ArchiveIndex
+from src.utils.LogDecorator import LogDecorator
+
+
+class ArchiveIndexer:
+    """
+    增量建立压缩包内容索引：全部分卷的总大小与最新修改时间未变化的压缩包直接跳过，
+    其余压缩包在线程池中读取成员列表后写入索引。
+    """
+    log = LogDecorator(__name__, console=False, logfile=str(log_file))
+
+    def __init__(self, index: Optional[ArchiveIndex] = None, lister: Optional[ArchiveLister] = None,
+                 max_workers: int = PREFLIGHT_WORKERS):
+        self.index = index if index is not None else ArchiveIndex(ARCHIVE_INDEX_FILE)
+        self.lister = lister if lister is not None else ArchiveLister()
+        self.max_workers = max_workers
+
+    def index_path(self, path: Union[Path, str], password: Optional[str] = None) -> Dict[str, int]:
+        """收集目录下的压缩包并建立索引"""
+        gatherer = FileGather(Queue(maxsize=64), path)
+        return self.index_groups(gatherer.stream_collection(), password)
+
+    def index_groups(self, groups: Iterable, password: Optional[str] = None) -> Dict[str, int]:
+        """
+        为 FileGather 产出的分组建立索引。
+        :return: 统计信息 {"indexed": 新建或更新数, "skipped": 未变化数, "failed": 读取失败数}。
+        """
+        stats = {"indexed": 0, "skipped": 0, "failed": 0}
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ArchiveIndexer") as executor:
+            futures = []
+            for group in groups:
+                volumes = [Path(group[0])] if isinstance(group, tuple) else [Path(item[0]) for item in group]
+                try:
+                    size, mtime_ns = self._signature(volumes)
+                except OSError as e:
+                    self.log.warning(f"无法读取文件信息，跳过索引: {volumes[0]}, 错误: {e}")
+                    stats["failed"] += 1
+                    continue
+                if self.index.is_current(volumes[0], size, mtime_ns):
+                    stats["skipped"] += 1
+                    continue
+                futures.append(executor.submit(self._index_one, volumes[0], size, mtime_ns, password))
+            for future in futures:
+                stats["indexed" if future.result() else "failed"] += 1
+        self.log.info(f"索引完成: {stats}")
+        return stats
+
+    def _index_one(self, path: Path, size: int, mtime_ns: int, password: Optional[str]) -> bool:
+        try:
+            listing = self.lister.list(path, password)
+        except CompressionError as e:
+            self.log.warning(f"读取成员列表失败: {path}, 错误: {e}")
+            self.index.put_error(path, size, mtime_ns, str(e))
+            return False
+        self.index.put(listing, size, mtime_ns)
+        return True
+
+    @staticmethod
+    def _signature(volumes: List[Path]) -> Tuple[int, int]:
+        """全部分卷的总大小与最新修改时间"""
+        stats = [os.stat(volume) for volume in volumes]
+        return sum(stat.st_size for stat in stats), max(stat.st_mtime_ns for stat in stats)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="压缩包内容索引")
+    parser.add_argument("--db", default=str(ARCHIVE_INDEX_FILE), help="索引数据库路径")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    index_parser = commands.add_parser("index", help="为目录下的压缩包建立索引")
+    index_parser.add_argument("path")
+    index_parser.add_argument("--password")
+    index_parser.add_argument("--prune", action="store_true", help="删除已不存在的压缩包记录")
+
+    search_parser = commands.add_parser("search", help="搜索成员")
+    search_parser.add_argument("pattern", nargs="?", help="通配符，区分大小写")
+    search_parser.add_argument("--name-only", action="store_true", help="只匹配文件名")
+    search_parser.add_argument("--min-size", type=int)
+    search_parser.add_argument("--max-size", type=int)
+    search_parser.add_argument("--archive", help="按压缩包路径过滤的通配符")
+    search_parser.add_argument("--limit", type=int)
+    args = parser.parse_args(argv)
+
+    index = ArchiveIndex(args.db)
+    try:
+        if args.command == "index":
+            if args.prune:
+                print(f"pruned: {index.prune()}")
+            print(ArchiveIndexer(index).index_path(args.path, args.password))
+        else:
+            hits = index.search(args.pattern, name_only=args.name_only, min_size=args.min_size,
+                                max_size=args.max_size, archive_pattern=args.archive, limit=args.limit)
+            for archive, member in hits:
+                print(f"{archive}\t{member.path}\t{member.size}")
+    finally:
+        index.close()
+
+
+if __name__ == '__main__':
+    main()
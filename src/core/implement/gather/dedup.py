@@ -0,0 +1,149 @@
+import hashlib
+import mmap
+import os
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config.gather_config import DEDUP_BLOCK_SIZE, HASH_CACHE_FILE
+from config.unzip_cinfig import log_file
+from src.models.DedupResult import DedupResult
+from src.utils.HashCache import HashCache
+from src.utils.LogDecorator import LogDecorator
+
+_FULL_HASH_CHUNK = 8 * 1024 * 1024
+
+
+class ArchiveDeduplicator:
+    """
+    解压前的内容去重：先按大小分组，再比较首尾块哈希，仍冲突时才计算全文件哈希。
+    分卷集合按全部分卷整体比较，每组相同内容只保留一个代表。
+    """
+    log = LogDecorator(__name__, console=False, logfile=str(log_file))
+
+    def __init__(self, block_size: int = DEDUP_BLOCK_SIZE, hash_cache: Optional[HashCache] = None):
+        self.block_size = block_size
+        if hash_cache is None and HASH_CACHE_FILE:
+            hash_cache = HashCache.shared(HASH_CACHE_FILE)
+        self.hash_cache = hash_cache
+
+    def deduplicate(self, groups: Iterable) -> DedupResult:
+        """
+        对收集到的分组去重。
+        :param groups: FileGather 产出的分组（[(path, type), ...] 或单个 (path, type)）。
+        :return: 去重结果。
+        """
+        result = DedupResult()
+        by_size: Dict[Tuple, List] = defaultdict(list)
+        for group in groups:
+            volumes = self._volumes(group)
+            try:
+                sizes = tuple(os.stat(volume).st_size for volume in volumes)
+            except OSError as e:
+                self.log.warning(f"无法读取文件大小，跳过去重: {volumes[0]}, 错误: {e}")
+                result.unique.append(group)
+                continue
+            by_size[sizes].append(group)
+
+        for sizes, candidates in by_size.items():
+            if len(candidates) == 1:
+                result.unique.append(candidates[0])
+                continue
+            # 小于两个块的文件首尾块已覆盖全部内容，无需再计算全文件哈希
+            covered = all(size <= 2 * self.block_size for size in sizes)
+            for partial_cluster in self._cluster(candidates, self._partial_signature).values():
+                if len(partial_cluster) == 1 or covered:
+                    self._keep(partial_cluster, result)
+                    continue
+                for full_cluster in self._cluster(partial_cluster, self._full_signature).values():
+                    self._keep(full_cluster, result)
+        return result
+
+    def _keep(self, cluster: List, result: DedupResult) -> None:
+        """保留路径排序最靠前的分组作为代表，其余记为重复项"""
+        cluster.sort(key=lambda group: str(self._volumes(group)[0]))
+        representative, duplicates = cluster[0], cluster[1:]
+        result.unique.append(representative)
+        if duplicates:
+            first = self._volumes(representative)[0]
+            result.duplicates[first] = [self._volumes(group)[0] for group in duplicates]
+            self.log.info(f"发现重复压缩包: {first} <- {result.duplicates[first]}")
+
+    def _cluster(self, groups: List, signature) -> Dict[Tuple, List]:
+        clusters: Dict[Tuple, List] = defaultdict(list)
+        for group in groups:
+            try:
+                clusters[signature(self._volumes(group))].append(group)
+            except OSError as e:
+                # 无法读取的分组单独成组，不参与去重
+                self.log.warning(f"计算哈希失败: {self._volumes(group)[0]}, 错误: {e}")
+                clusters[("error", id(group))].append(group)
+        return dict(clusters)
+
+    def _partial_signature(self, volumes: List[Path]) -> Tuple:
+        return tuple(self.partial_hash(volume) for volume in volumes)
+
+    def _full_signature(self, volumes: List[Path]) -> Tuple:
+        return tuple(self.full_hash(volume) for volume in volumes)
+
+    def partial_hash(self, path: Path) -> str:
+        """计算文件首尾块哈希"""
+        key = HashCache.key_of(os.stat(path))
+        if self.hash_cache is not None:
+            cached = self.hash_cache.get_partial(key, self.block_size)
+            if cached is not None:
+                return cached
+
+        digest = hashlib.blake2b(str(key[2]).encode())
+        with open(path, "rb") as f:
+            if key[2]:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    digest.update(mm[:self.block_size])
+                    digest.update(mm[-self.block_size:])
+        value = digest.hexdigest()
+
+        if self.hash_cache is not None:
+            self.hash_cache.put_partial(key, self.block_size, value)
+        return value
+
+    def full_hash(self, path: Path) -> str:
+        """计算全文件哈希"""
+        key = HashCache.key_of(os.stat(path))
+        if self.hash_cache is not None:
+            cached = self.hash_cache.get_full(key)
+            if cached is not None:
+                return cached
+
+        digest = hashlib.blake2b()
+        with open(path, "rb") as f:
+            if key[2]:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    view = memoryview(mm)
+                    try:
+                        for offset in range(0, len(mm), _FULL_HASH_CHUNK):
+                            digest.update(view[offset:offset + _FULL_HASH_CHUNK])
+                    finally:
+                        view.release()
+        value = digest.hexdigest()
+
+        if self.hash_cache is not None:
+            self.hash_cache.put_full(key, value)
+        return value
+
+    @staticmethod
+    def _volumes(group) -> List[Path]:
+        """分组内全部分卷路径，兼容单文件 (path, type)"""
+        if isinstance(group, tuple):
+            return [Path(group[0])]
+        return [Path(item[0]) for item in group]
+
+
+if __name__ == '__main__':
+    from queue import Queue
+
+    from src.core.implement.gather.file_gather import FileGather
+
+    fg = FileGather(Queue(), r"E:\下载文件\百度网盘下载文件\15")
+    fg.start_collection()
+    dedup = ArchiveDeduplicator().deduplicate(fg.get_collection())
+    print(len(dedup.unique), dedup.duplicate_count)
@@ -2,6 +2,7 @@ from pathlib import Path
 
 from src.core.interfaces.gather_interfaces import GatherInterfaces
 from src.enumerate.gather_enum import Mode
+from src.models.DirectoryScan import DirectoryScan
 
 
 class DirectoryGather(GatherInterfaces):
@@ -22,20 +23,21 @@ class DirectoryGather(GatherInterfaces):
         if self._should_stop:
             return
         try:
-            if self.check_directory_content(directory, Mode.DIR):
-                self._handle_pure_dir(directory)
-            elif self.check_directory_content(directory, Mode.ALL):
-                self.queue.put(Path(directory))
+            scan = self.scan_directory(directory)
         except ValueError as e:
             self.log.info(f"跳过无效目录: {e}")
+            return
+        if scan.mode == Mode.DIR:
+            self._handle_pure_dir(scan)
+        elif scan.has_files:
+            self._put(Path(directory))
 
-    def _handle_pure_dir(self, directory: Path) -> None:
+    def _handle_pure_dir(self, scan: DirectoryScan) -> None:
         """处理纯目录结构"""
-        for item in directory.iterdir():
+        for entry in scan.dirs:
             if self._should_stop:
                 return
-            if item.is_dir():
-                self._process_directory(item)  # 递归处理子目录
+            self._process_directory(Path(entry.path))  # 递归处理子目录
 
 
 if __name__ == '__main__':
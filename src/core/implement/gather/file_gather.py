@@ -1,26 +1,90 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from queue import Queue
+from typing import List, Optional, Tuple, Union
 
+from config.gather_config import COMPRESS, GATHER_WORKERS
 from src.core.interfaces.gather_interfaces import GatherInterfaces
 from src.enumerate.gather_enum import Mode
+from src.models.DirectoryScan import DirectoryScan
+from src.models.VolumeSet import VolumeSet
+from src.utils.VolumeIndex import VolumeIndex
 
 
 class FileGather(GatherInterfaces):
 
+    def __init__(self, queue: Queue, path: Optional[Union[Path, str]] = None, types: set = COMPRESS,
+                 max_workers: int = GATHER_WORKERS):
+        super().__init__(queue, path, types)
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None  # 并行遍历时的线程池
+        self._pending = 0  # 尚未完成的目录任务数
+        self._pending_cond = threading.Condition()
+        self.incomplete_sets: List[VolumeSet] = []  # 本次收集中发现的缺失分卷的集合
+
+    def set_max_workers(self, max_workers: int) -> None:
+        """设置并行遍历的线程数，1 表示单线程递归遍历"""
+        if max_workers < 1:
+            raise ValueError("线程数必须大于0")
+        self.max_workers = max_workers
+
     def start_collection(self) -> None:
-        self._should_stop = False  # 重置标志
+        self._reset_stop()  # 重置标志
+        self.incomplete_sets = []
         target_path: Path = self.get_path()
         if target_path is None:
             raise ValueError("文件路径未设置")
         if target_path.is_file():
             self._process_single(target_path)
         elif target_path.is_dir():
-            self._process_directory(target_path)
+            if self.max_workers > 1:
+                self._parallel_collect(target_path)
+            else:
+                self._process_directory(target_path)
+
+    def _parallel_collect(self, root: Path) -> None:
+        """并行遍历：子目录分发到线程池，等待所有目录任务完成"""
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="FileGather") as executor:
+            self._executor = executor
+            try:
+                self._submit_directory(root)
+                with self._pending_cond:
+                    while self._pending:
+                        self._pending_cond.wait()
+            finally:
+                self._executor = None
+
+    def _submit_directory(self, directory: Path) -> None:
+        """提交目录任务"""
+        with self._pending_cond:
+            self._pending += 1
+        try:
+            self._executor.submit(self._run_directory_task, directory)
+        except RuntimeError:
+            # 线程池已关闭
+            self._task_done()
+
+    def _run_directory_task(self, directory: Path) -> None:
+        """线程池中执行的目录任务"""
+        try:
+            self._process_directory(directory)
+        except Exception as e:
+            self.log.error(f"目录处理失败: {directory}, 错误: {e}")
+        finally:
+            self._task_done()
+
+    def _task_done(self) -> None:
+        with self._pending_cond:
+            self._pending -= 1
+            if not self._pending:
+                self._pending_cond.notify_all()
 
     def _process_single(self, file_path: Path) -> None:
         """处理单个文件"""
         file_type = self.get_type_name(file_path)
         if file_type in self.type:
-            self.queue.put((file_path, file_type))
+            self._put((file_path, file_type))
             self.log.info(f"{file_path} 添加到队列中")
 
     def _process_directory(self, directory: Path) -> None:
@@ -28,67 +92,52 @@ class FileGather(GatherInterfaces):
         if self._should_stop:
             return
         try:
-            if self.check_directory_content(directory, Mode.DIR):
-                self._handle_pure_dir(directory)
-            elif self.check_directory_content(directory, Mode.FILE):
-                self._collect_files(directory)
+            scan = self.scan_directory(directory)
         except ValueError as e:
             print(f"跳过无效目录: {e}")
+            return
+        if scan.mode == Mode.DIR:
+            self._handle_pure_dir(scan)
+        elif scan.mode == Mode.FILE:
+            self._collect_files(scan)
 
-    def _handle_pure_dir(self, directory: Path) -> None:
+    def _handle_pure_dir(self, scan: DirectoryScan) -> None:
         """处理纯目录结构"""
-        for item in directory.iterdir():
+        for entry in scan.dirs:
             if self._should_stop:
                 return
-            if item.is_dir():
-                self._process_directory(item)  # 递归处理子目录
-
-    def _collect_files(self, directory: Path) -> None:
-        """收集纯文件目录"""
-        file_groups = {}  # 文件名分组: {name: [files]}
-        has_target_files = set()  # 包含目标文件的分组名
-
-        for item in directory.iterdir():
-            if self._should_stop:  # 关键停止点
-                break
-            # 确保只处理文件
-            if not item.is_file():
-                continue
-
-            # 获取文件类型
-            try:
-                fctype = self.get_type_name(item)
-            except Exception as e:
-                self.log.error(f"文件类型识别失败: {item}, 错误: {e}")
-                continue
-
-            # 提取主文件名
-            item_name = item.stem.split(".", 1)[0]
-
-            # 初始化分组
-            if item_name not in file_groups:
-                file_groups[item_name] = []
-
-            # 添加文件到分组
-            file_groups[item_name].append((item, fctype))
-
-            # 标记目标文件分组
-            if fctype in self.type:
-                has_target_files.add(item_name)
-
-        # 仅保留含目标文件的分组
-        valid_groups = {
-            name: files
-            for name, files in file_groups.items()
-            if name in has_target_files
-        }
-        if self._should_stop:
-            return  # 停止收集
-        # 加入队列
-        for group in valid_groups.values():
-            self.queue.put(group)
+            if self._executor is not None:
+                self._submit_directory(Path(entry.path))  # 并行模式下分发到线程池
+            else:
+                self._process_directory(Path(entry.path))  # 递归处理子目录
+
+    def _collect_files(self, scan: DirectoryScan) -> None:
+        """收集纯文件目录：按分卷集合分组，组内首个元素即解压入口"""
+        for group in self._group_files(scan):
+            if self._should_stop:
+                return  # 停止收集
+            self._put(group)
             self.log.info(f"分组入队: {[f[0].name for f in group]}")
 
+    def _group_files(self, scan: DirectoryScan) -> List[List[Tuple[Path, str]]]:
+        """将目录内的文件归组为分卷集合，每组只识别首个分卷，返回含目标类型的分组"""
+        complete_sets = []
+        for volume_set in VolumeIndex.build(scan.file_paths()):
+            if volume_set.is_complete:
+                complete_sets.append(volume_set)
+            else:
+                self.incomplete_sets.append(volume_set)
+                self.log.warning(f"分卷不完整: {volume_set.first}, 缺失: {volume_set.missing}")
+
+        # 非首个分卷不参与识别，沿用首个分卷的类型
+        fctypes = self.get_type_names([volume_set.first for volume_set in complete_sets])
+
+        return [
+            [(volume, fctype) for volume in volume_set.volumes]
+            for volume_set, fctype in zip(complete_sets, fctypes)
+            if fctype in self.type
+        ]
+
 
 if __name__ == '__main__':
     from queue import Queue
@@ -0,0 +1,163 @@
+import os
+import time
+from pathlib import Path
+from queue import Queue
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from config.gather_config import COMPRESS, WATCH_POLL_INTERVAL, WATCH_STABLE_SECONDS
+from src.core.implement.gather.file_gather import FileGather
+from src.models.VolumeSet import VolumeSet
+from src.utils.FileWatcher import FileWatcher
+from src.utils.VolumeIndex import VolumeIndex
+
+
+class WatchGather(FileGather):
+    """
+    监听模式收集器：持续监听目录变化，文件（或整个分卷集合）大小在 stable_seconds 内不再变化后，
+    只将新出现的分组放入队列。Linux 下使用 inotify，其它平台回退为快照对比轮询。
+    """
+
+    def __init__(self, queue: Queue, path: Optional[Union[Path, str]] = None, types: set = COMPRESS,
+                 stable_seconds: float = WATCH_STABLE_SECONDS, poll_interval: float = WATCH_POLL_INTERVAL,
+                 use_inotify: bool = True, initial_scan: bool = True):
+        super().__init__(queue, path, types)
+        self.stable_seconds = stable_seconds
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.initial_scan = initial_scan
+        self._unstable: Dict[Path, Tuple[int, int, float]] = {}  # 未稳定的文件: (大小, 修改时间, 最后变化时刻)
+        self._emitted: Dict[Tuple, Tuple] = {}  # 已入队的分卷集合及其文件状态
+        self._emitted_keys: Dict[Path, Tuple] = {}  # 已入队的分卷 -> 所属分卷集合
+
+    def start_collection(self) -> None:
+        """阻塞监听，直到调用 stop_collection()"""
+        self._reset_stop()
+        self.incomplete_sets = []
+        target_path: Path = self.get_path()
+        if target_path is None:
+            raise ValueError("文件路径未设置")
+        if not target_path.is_dir():
+            raise ValueError("监听模式只能处理目录")
+
+        # 先建立监听再做初始扫描，避免遗漏扫描期间写入的文件
+        watcher = FileWatcher.create(target_path, self.use_inotify)
+        try:
+            if self.initial_scan:
+                self._scan_existing(target_path)
+            while not self._should_stop:
+                self._track(watcher.poll(self.poll_interval))
+                stable = self._collect_stable()
+                if stable:
+                    self._emit_stable(stable)
+        finally:
+            watcher.close()
+
+    def _scan_existing(self, root: Path) -> None:
+        """
+        初始扫描：已有文件同样经过稳定性检查，由 _emit_stable 入队并记录，稳定后不会重复入队。
+        修改时间早于 stable_seconds 的文件在首次检查时即视为稳定。
+        """
+        now, wall_now = time.monotonic(), time.time_ns()
+        for directory, _, names in os.walk(root):
+            if self._should_stop:
+                return
+            for name in names:
+                path = Path(directory) / name
+                try:
+                    stat_result = os.stat(path)
+                except OSError:
+                    continue
+                idle = min(max((wall_now - stat_result.st_mtime_ns) / 1e9, 0.0), self.stable_seconds)
+                self._unstable[path] = (stat_result.st_size, stat_result.st_mtime_ns, now - idle)
+
+    def _track(self, changed: Iterable[Path]) -> None:
+        """记录发生变化的文件，重置其稳定计时；文件被删除时移除其入队记录，重新出现后可再次入队"""
+        now = time.monotonic()
+        for path in changed:
+            try:
+                stat_result = os.stat(path)
+            except OSError:
+                self._unstable.pop(path, None)
+                self._forget(path)
+                continue
+            self._unstable[path] = (stat_result.st_size, stat_result.st_mtime_ns, now)
+
+    def _collect_stable(self) -> Set[Path]:
+        """检查未稳定的文件，返回已稳定的文件"""
+        now = time.monotonic()
+        stable = set()
+        for path, (size, mtime_ns, changed_at) in list(self._unstable.items()):
+            try:
+                stat_result = os.stat(path)
+            except OSError:
+                del self._unstable[path]
+                continue
+            if (stat_result.st_size, stat_result.st_mtime_ns) != (size, mtime_ns):
+                self._unstable[path] = (stat_result.st_size, stat_result.st_mtime_ns, now)
+            elif now - changed_at >= self.stable_seconds:
+                del self._unstable[path]
+                stable.add(path)
+        return stable
+
+    def _emit_stable(self, stable: Set[Path]) -> None:
+        """按目录重新归组，只将包含稳定文件且全部分卷均已稳定的新分组入队"""
+        ready: List[Tuple[VolumeSet, Tuple]] = []
+        for directory in {path.parent for path in stable}:
+            try:
+                scan = self.scan_directory(directory)
+            except ValueError:
+                continue
+            for volume_set in VolumeIndex.build(scan.file_paths()):
+                if not stable.intersection(volume_set.volumes):
+                    continue
+                if any(volume in self._unstable for volume in volume_set.volumes):
+                    continue  # 仍有分卷在写入，等待其稳定后再处理
+                if not volume_set.is_complete:
+                    self.log.warning(f"分卷不完整，等待缺失分卷: {volume_set.first}, 缺失: {volume_set.missing}")
+                    continue
+                signature = self._signature(volume_set)
+                if signature is None:
+                    self._emitted.pop(volume_set.key, None)  # 有分卷已消失
+                    continue
+                if self._emitted.get(volume_set.key) == signature:
+                    continue
+                ready.append((volume_set, signature))
+
+        fctypes = self.get_type_names([volume_set.first for volume_set, _ in ready])
+        for (volume_set, signature), fctype in zip(ready, fctypes):
+            if self._should_stop:
+                return
+            if fctype not in self.type:
+                continue
+            group = [(volume, fctype) for volume in volume_set.volumes]
+            self._put(group)
+            # 只记录实际入队的分组，非压缩包不占用记录
+            self._emitted[volume_set.key] = signature
+            for volume in volume_set.volumes:
+                self._emitted_keys[volume] = volume_set.key
+            self.log.info(f"监听到新分组入队: {[f[0].name for f in group]}")
+
+    def _forget(self, path: Path) -> None:
+        """移除 path（文件或被删除的目录）下已入队分卷所属分卷集合的记录"""
+        removed = [volume for volume in self._emitted_keys if volume == path or path in volume.parents]
+        for volume in removed:
+            self._emitted.pop(self._emitted_keys.pop(volume), None)
+
+    @staticmethod
+    def _signature(volume_set: VolumeSet) -> Optional[Tuple]:
+        """分卷集合的文件状态，用于判断是否已入队过"""
+        signature = []
+        for volume in volume_set.volumes:
+            try:
+                stat_result = os.stat(volume)
+            except OSError:
+                return None
+            signature.append((volume.name, stat_result.st_size, stat_result.st_mtime_ns))
+        return tuple(signature)
+
+
+if __name__ == '__main__':
+    fp = r"E:\下载文件\百度网盘下载文件"
+    wg = WatchGather(Queue(maxsize=64), fp, stable_seconds=10)
+    for group in wg.stream_collection():
+        print(group)
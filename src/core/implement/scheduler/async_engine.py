@@ -0,0 +1,113 @@
+import asyncio
+from typing import Iterable, List, Optional, Set
+
+from config.unzip_cinfig import log_file
+from src.core.interfaces.unzip_interfaces import BaseTool
+from src.exceptions.unzip_excepotion import ExecutionTimeoutError
+from src.utils.LogDecorator import LogDecorator
+
+
+class AsyncExecutionEngine:
+    """
+    异步执行引擎：在同一事件循环中并发执行多个 async_execute()，由信号量限制同时运行的子进程数。
+    每个工具持有独立的子进程句柄，单任务超时、全局超时或任务被取消时均会终止对应子进程。
+    """
+    log = LogDecorator(__name__, console=False, logfile=str(log_file))
+
+    def __init__(self, max_concurrency: int = 8, job_timeout: Optional[float] = None,
+                 total_timeout: Optional[float] = None):
+        """
+        :param max_concurrency: 同时运行的子进程上限。
+        :param job_timeout: 单个任务的默认超时时间（秒），从任务开始运行时计时。
+        :param total_timeout: run_all 的全局超时时间（秒），超时后取消全部未完成的任务。
+        """
+        self.max_concurrency = max_concurrency
+        self.job_timeout = job_timeout
+        self.total_timeout = total_timeout
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # 信号量需在事件循环内创建
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def run(self, tool: BaseTool, timeout: Optional[float] = None) -> str:
+        """在并发名额内执行单个工具，timeout 未设置时使用 job_timeout"""
+        timeout = self.job_timeout if timeout is None else timeout
+        async with self._get_semaphore():
+            return await tool.async_execute(timeout)
+
+    def submit(self, tool: BaseTool, timeout: Optional[float] = None) -> asyncio.Task:
+        """将工具作为任务提交到当前事件循环，返回的任务可单独取消"""
+        task = asyncio.ensure_future(self.run(tool, timeout))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def run_all(self, tools: Iterable[BaseTool], return_exceptions: bool = True) -> List:
+        """
+        并发执行全部工具，结果顺序与传入顺序一致。
+        :param return_exceptions: 为 True 时失败任务的异常作为结果返回，否则抛出首个异常并取消其余任务。
+        :raises ExecutionTimeoutError: 超过全局超时时间。
+        """
+        tasks = [self.submit(tool) for tool in tools]
+        if not tasks:
+            return []
+        try:
+            done, pending = await asyncio.wait(
+                tasks, timeout=self.total_timeout,
+                return_when=asyncio.ALL_COMPLETED if return_exceptions else asyncio.FIRST_EXCEPTION
+            )
+        except asyncio.CancelledError:
+            await self._cancel(tasks)
+            raise
+
+        if pending:
+            await self._cancel(pending)
+            failed = [task for task in done if not task.cancelled() and task.exception() is not None]
+            if failed and not return_exceptions:
+                raise failed[0].exception()
+            self.log.warning(f"全局超时（{self.total_timeout}秒），已取消 {len(pending)} 个任务")
+            raise ExecutionTimeoutError(f"执行超时（{self.total_timeout}秒），已取消 {len(pending)} 个任务")
+
+        results = []
+        for task in tasks:
+            if task.cancelled():
+                error = asyncio.CancelledError()
+            else:
+                error = task.exception()
+            if error is not None and not return_exceptions:
+                raise error
+            results.append(error if error is not None else task.result())
+        return results
+
+    def cancel_all(self) -> None:
+        """取消全部未完成的任务，任务取消时会终止其子进程"""
+        for task in list(self._tasks):
+            task.cancel()
+
+    @staticmethod
+    async def _cancel(tasks: Iterable[asyncio.Task]) -> None:
+        """取消任务并等待子进程清理完成"""
+        tasks = list(tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+if __name__ == '__main__':
+    from src.factories.JudgementSoftware import JudgementSoftware
+
+    async def main():
+        judgement = JudgementSoftware()
+        tools = [
+            judgement.judgement_decompressor().set_input_path(path).set_output_path(path + "_out")
+            for path in (r"E:\下载文件\a.zip", r"E:\下载文件\b.7z")
+        ]
+        engine = AsyncExecutionEngine(max_concurrency=4, job_timeout=600, total_timeout=3600)
+        for result in await engine.run_all(tools):
+            print(result)
+
+    asyncio.run(main())
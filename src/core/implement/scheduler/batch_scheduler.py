@@ -0,0 +1,323 @@
+import itertools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from queue import Empty, Queue
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Union
+
+from config.unzip_cinfig import PREFLIGHT_WORKERS, log_file
+from src.core.implement.scheduler.device_policy import DeviceConcurrencyPolicy
+from src.core.implement.scheduler.disk_policy import DiskSpacePolicy
+from src.core.interfaces.gather_interfaces import END_OF_STREAM
+from src.core.interfaces.unzip_interfaces import DecompressionTool
+from src.enumerate.unzip_enum import JobStatus
+from src.exceptions.unzip_excepotion import InsufficientSpaceError, TerminationError
+from src.models.ArchiveListing import ArchiveListing
+from src.models.ExtractionJob import ExtractionJob
+from src.utils.LogDecorator import LogDecorator
+from src.utils.VolumeIndex import VolumeIndex
+
+if TYPE_CHECKING:
+    from src.factories.BackendRouter import BackendRouter
+
+class BatchScheduler:
+    """
+    批量解压调度器：从 FileGather 的队列中取出分组，为每个任务创建独立的解压工具，
+    最多同时运行 max_jobs 个子进程，支持取消单个或全部任务。
+    设置 policy 时，任务先进入等待队列，由 policy 按设备决定何时放行。
+    设置 router 时按任务的压缩包类型选择解压后端，tool_factory 不再生效。
+    设置 space_policy 时，任务提交后先读取成员列表估算解压大小，输出设备空间足够时才放行。
+    """
+    log = LogDecorator(__name__, console=False, logfile=str(log_file))
+
+    def __init__(self, output_root: Union[Path, str], max_jobs: int = 4, password: Optional[str] = None,
+                 tool_factory: Optional[Callable[[], DecompressionTool]] = None,
+                 policy: Optional[DeviceConcurrencyPolicy] = None, router: Optional['BackendRouter'] = None,
+                 space_policy: Optional[DiskSpacePolicy] = None):
+        self.output_root = Path(output_root)
+        self.max_jobs = max_jobs
+        self.password = password
+        self.policy = policy
+        self.router = router
+        self.space_policy = space_policy
+        self._tool_factory = tool_factory
+        self._executor = ThreadPoolExecutor(max_workers=max_jobs, thread_name_prefix="BatchScheduler")
+        self._preflight_executor = ThreadPoolExecutor(
+            max_workers=PREFLIGHT_WORKERS, thread_name_prefix="Preflight"
+        ) if space_policy is not None else None  # 预检会启动子进程，不占用解压线程
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._jobs: Dict[int, ExtractionJob] = {}
+        self._running: Dict[int, DecompressionTool] = {}  # 运行中任务的解压工具登记表
+        self._pending: List[ExtractionJob] = []  # 等待放行的任务
+        self._active = 0  # 已放行到线程池的任务数
+        self._output_names: Dict[str, int] = {}
+
+    @property
+    def jobs(self) -> List[ExtractionJob]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    @property
+    def running_jobs(self) -> List[ExtractionJob]:
+        with self._lock:
+            return [self._jobs[job_id] for job_id in self._running]
+
+    def create_tool(self, job: Optional[ExtractionJob] = None) -> DecompressionTool:
+        """
+        创建解压工具：设置了 router 时按任务类型选择，设置了 tool_factory 时使用 tool_factory，
+        否则通过 JudgementSoftware 选择支持该类型的可用软件。
+        """
+        if self.router is not None and job is not None:
+            return self.router.decompressor_for(job.file_type, multi_volume=len(job.volumes) > 1)
+        if self._tool_factory is not None:
+            return self._tool_factory()
+        from src.factories.JudgementSoftware import JudgementSoftware
+        return JudgementSoftware(file_type=job.file_type if job is not None else None).judgement_decompressor()
+
+    def submit(self, group, output_path: Optional[Union[Path, str]] = None,
+               listing: Optional[ArchiveListing] = None, depth: int = 0,
+               parent_id: Optional[int] = None) -> ExtractionJob:
+        """
+        提交一个分组。
+        :param group: FileGather 产出的分组（[(path, type), ...] 或单个 (path, type)）。
+        :param output_path: 输出目录，默认为 output_root 下以压缩包名命名的目录。
+        :param listing: 已读取的成员列表，设置了 space_policy 时不再重复读取。
+        :param depth: 嵌套层级。
+        :param parent_id: 产出该压缩包的任务。
+        :return: 解压任务，job.future 可用于等待结果。
+        """
+        items = [group] if isinstance(group, tuple) else list(group)
+        first, file_type = Path(items[0][0]), items[0][1]
+        volumes = [Path(item[0]) for item in items]
+        with self._lock:
+            job = ExtractionJob(
+                job_id=next(self._ids),
+                input_path=first,
+                output_path=Path(output_path) if output_path else self._output_dir(volumes),
+                file_type=file_type,
+                volumes=volumes,
+                password=self.password,
+                listing=listing,
+                required_bytes=listing.total_size if listing is not None else 0,
+                depth=depth,
+                parent_id=parent_id
+            )
+            job.future = Future()
+            self._jobs[job.job_id] = job
+        if self._preflight_executor is not None:
+            self._preflight_executor.submit(self._preflight, job)
+        else:
+            self._enqueue(job)
+        return job
+
+    def submit_all(self, groups: Iterable) -> List[ExtractionJob]:
+        """提交多个分组，可直接传入 stream_collection() 以边收集边解压"""
+        return [self.submit(group) for group in groups]
+
+    def submit_from_queue(self, queue: Queue, block: bool = False) -> List[ExtractionJob]:
+        """
+        从收集队列中取出分组并提交。
+        :param block: 为 True 时持续等待，直到取到 END_OF_STREAM 哨兵。
+        """
+        jobs = []
+        while True:
+            try:
+                group = queue.get(block=block)
+            except Empty:
+                break
+            if group is END_OF_STREAM:
+                break
+            jobs.append(self.submit(group))
+        return jobs
+
+    @staticmethod
+    def output_name(volumes: List[Path]) -> str:
+        """按 VolumeIndex 的分卷规则去掉分卷后缀与扩展名的压缩包名"""
+        volume_sets = VolumeIndex.build(volumes)
+        volume_set = next((item for item in volume_sets if volumes[0] in item.volumes), volume_sets[0])
+        return VolumeIndex.archive_name(volume_set)
+
+    def _output_dir(self, volumes: List[Path]) -> Path:
+        """根据分卷生成输出目录，已存在或已分配给其它任务时追加序号，调用方持有锁"""
+        name = self.output_name(volumes)
+        count = self._output_names.get(name, 0)
+        candidate = self.output_root / (name if count == 0 else f"{name}_{count}")
+        while candidate.exists():
+            count += 1
+            candidate = self.output_root / f"{name}_{count}"
+        self._output_names[name] = count + 1
+        return candidate
+
+    def _preflight(self, job: ExtractionJob) -> None:
+        """读取成员列表估算所需空间，完成后进入等待队列"""
+        try:
+            if job.status != JobStatus.CANCELLED and job.listing is None:
+                self.space_policy.inspect(job)
+        finally:
+            self._enqueue(job)
+
+    def _enqueue(self, job: ExtractionJob) -> None:
+        """进入等待队列并尝试放行，设备与输入大小需要 stat，在调度锁外预先记录"""
+        if self.policy is not None and job.status != JobStatus.CANCELLED:
+            self.policy.prepare(job)
+        with self._lock:
+            cancelled = job.status == JobStatus.CANCELLED
+            if not cancelled:
+                self._pending.append(job)
+        if cancelled:
+            if self.policy is not None:
+                self.policy.forget(job)
+            # 进入等待队列前被取消的任务，cancel() 不会通知等待方
+            job.future.set_running_or_notify_cancel()
+        else:
+            self._dispatch()
+
+    def _dispatch(self) -> None:
+        """按提交顺序放行等待中的任务，跳过设备名额或磁盘空间不足的任务以免阻塞其它设备"""
+        rejected = []
+        with self._lock:
+            for job in list(self._pending):
+                if self._active >= self.max_jobs:
+                    break
+                if self.space_policy is not None and not self.space_policy.try_acquire(job):
+                    if not self.space_policy.can_ever_fit(job):
+                        self._pending.remove(job)
+                        rejected.append(job)
+                    continue
+                if self.policy is not None and not self.policy.try_acquire(job):
+                    if self.space_policy is not None:
+                        self.space_policy.release(job)
+                    continue
+                self._pending.remove(job)
+                self._active += 1
+                self._executor.submit(self._execute, job)
+        for job in rejected:
+            self._reject(job)
+
+    def _reject(self, job: ExtractionJob) -> None:
+        """输出设备空闲时仍放不下的任务直接失败，不再等待"""
+        error = InsufficientSpaceError(
+            f"磁盘空间不足：{job.output_path} 需要 {self.space_policy.required(job)} 字节，"
+            f"可用 {self.space_policy.free_space(job.output_path)} 字节"
+        )
+        job.error = error
+        job.status = JobStatus.FAILED
+        job.finished_at = time.monotonic()
+        if self.policy is not None:
+            self.policy.forget(job)
+        self.log.error(f"解压失败: {job.input_path}, 错误: {error}")
+        if job.future.set_running_or_notify_cancel():
+            job.future.set_exception(error)
+
+    def _execute(self, job: ExtractionJob) -> None:
+        """线程池入口，将执行结果写入任务的 Future 后放行后续任务"""
+        try:
+            if not job.future.set_running_or_notify_cancel():
+                return
+            try:
+                job.future.set_result(self._run_job(job))
+            except BaseException as e:
+                job.future.set_exception(e)
+        finally:
+            if self.policy is not None:
+                self.policy.release(job)
+            if self.space_policy is not None:
+                self.space_policy.release(job)
+            with self._lock:
+                self._active -= 1
+            self._dispatch()
+
+    def _run_job(self, job: ExtractionJob) -> str:
+        """在线程池中执行任务，结束前写入任务状态，保证 wait() 返回时状态已更新"""
+        tool = self.create_tool(job)
+        tool.set_input_path(str(job.input_path)).set_output_path(str(job.output_path))
+        if job.password:
+            tool.set_password(job.password)
+        # 登记到 _running 与子进程启动之间被取消时，由工具在登记子进程后终止
+        tool.cancel_requested = lambda: job.cancel_requested
+        with self._lock:
+            if job.status == JobStatus.CANCELLED:
+                raise TerminationError("终止")
+            job.status = JobStatus.RUNNING
+            job.started_at = time.monotonic()
+            self._running[job.job_id] = tool
+        try:
+            job.result = tool.execute()
+            job.status = JobStatus.DONE
+            self.log.info(f"解压完成: {job.input_path} -> {job.output_path}")
+            return job.result
+        except TerminationError:
+            job.status = JobStatus.CANCELLED
+            self.log.info(f"解压已取消: {job.input_path}")
+            raise
+        except Exception as e:
+            job.error = e
+            job.status = JobStatus.FAILED
+            self.log.error(f"解压失败: {job.input_path}, 错误: {e}")
+            raise
+        finally:
+            job.finished_at = time.monotonic()
+            with self._lock:
+                self._running.pop(job.job_id, None)
+            tool.thread_executor.shutdown(wait=False)
+
+    def cancel(self, job_id: int) -> bool:
+        """取消任务：未开始的直接取消，运行中的终止其子进程"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in (JobStatus.DONE, JobStatus.FAILED, JobStatus.CANCELLED):
+                return False
+            tool = self._running.get(job_id)
+            queued = job in self._pending
+            if tool is not None:
+                job.cancel_requested = True
+            else:
+                job.status = JobStatus.CANCELLED
+                if queued:
+                    self._pending.remove(job)
+                    if self.policy is not None:
+                        self.policy.forget(job)
+        if tool is None:
+            # 未放行的任务不会经过 _execute，需在此通知等待方
+            if job.future.cancel() and queued:
+                job.future.set_running_or_notify_cancel()
+            return True
+        tool.terminate_process()
+        return True
+
+    def cancel_all(self) -> None:
+        """取消全部未完成的任务"""
+        for job in self.jobs:
+            self.cancel(job.job_id)
+
+    def wait(self, timeout: Optional[float] = None) -> List[ExtractionJob]:
+        """等待已提交的全部任务结束"""
+        wait([job.future for job in self.jobs if job.future is not None], timeout=timeout)
+        return self.jobs
+
+    def shutdown(self, wait_jobs: bool = True, cancel: bool = False) -> None:
+        if cancel:
+            self.cancel_all()
+        if wait_jobs:
+            self.wait()  # 等待队列中的任务由已结束的任务放行，需先等待全部任务结束
+        if self._preflight_executor is not None:
+            self._preflight_executor.shutdown(wait=wait_jobs)
+        self._executor.shutdown(wait=wait_jobs)
+
+    def __enter__(self) -> 'BatchScheduler':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.shutdown(cancel=exc_type is not None)
+
+
+if __name__ == '__main__':
+    from src.core.implement.gather.file_gather import FileGather
+
+    fg = FileGather(Queue(maxsize=64), r"E:\下载文件\百度网盘下载文件\15")
+    with BatchScheduler(r"E:\解压输出", max_jobs=8, policy=DeviceConcurrencyPolicy()) as scheduler:
+        scheduler.submit_all(fg.stream_collection())
+        for finished in scheduler.wait():
+            print(finished.job_id, finished.status, finished.input_path)
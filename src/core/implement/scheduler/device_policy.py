@@ -0,0 +1,135 @@
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from config.unzip_cinfig import log_file
+from src.models.ExtractionJob import ExtractionJob
+from src.utils.LogDecorator import LogDecorator
+
+
+@dataclass
+class _DeviceState:
+    """单个设备的并发状态"""
+    limit: int
+    active: int = 0
+    window_bytes: int = 0
+    window_jobs: int = 0
+    window_start: float = 0.0
+    last_throughput: Optional[float] = None
+
+
+class DeviceConcurrencyPolicy:
+    """
+    按设备限制并发的调度策略：以输入、输出路径的 st_dev 区分设备，每个设备单独限制并发数，
+    并根据观测到的吞吐量自适应调整（吞吐上升时增加并发，下降时回退）。
+    """
+    log = LogDecorator(__name__, console=False, logfile=str(log_file))
+
+    def __init__(self, initial_limit: int = 2, min_limit: int = 1, max_limit: int = 8,
+                 sample_jobs: int = 4, tolerance: float = 0.05):
+        """
+        :param initial_limit: 每个设备的初始并发数。
+        :param min_limit: 并发数下限。
+        :param max_limit: 并发数上限。
+        :param sample_jobs: 每完成多少个任务评估一次吞吐量。
+        :param tolerance: 吞吐量变化小于该比例时视为持平，不调整并发数。
+        """
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.sample_jobs = sample_jobs
+        self.tolerance = tolerance
+        self._lock = threading.Lock()
+        self._devices: Dict[int, _DeviceState] = {}
+        self._job_info: Dict[int, Tuple[Tuple[int, ...], int]] = {}  # 任务 -> (涉及的设备, 输入大小)，由 prepare() 计算
+
+    def limits(self) -> Dict[int, int]:
+        """各设备当前的并发上限"""
+        with self._lock:
+            return {device: state.limit for device, state in self._devices.items()}
+
+    def prepare(self, job: ExtractionJob) -> None:
+        """
+        记录任务涉及的设备与输入大小，任务进入等待队列前调用。
+        两者都需要 stat，应在调度器的锁外调用；大小在放行前记录，解压后源文件被移动或删除也不影响吞吐量样本。
+        """
+        info = (self._devices_of(job), job.input_size)
+        with self._lock:
+            self._job_info[job.job_id] = info
+
+    def try_acquire(self, job: ExtractionJob) -> bool:
+        """任务涉及的全部设备均有空闲名额时占用名额并返回 True，未经 prepare() 的任务先补算设备与大小"""
+        with self._lock:
+            prepared = job.job_id in self._job_info
+        if not prepared:
+            self.prepare(job)
+        with self._lock:
+            info = self._job_info[job.job_id]
+            states = [self._state(device) for device in info[0]]
+            if any(state.active >= state.limit for state in states):
+                return False
+            for state in states:
+                if state.active == 0 and state.window_jobs == 0:
+                    state.window_start = time.monotonic()
+                state.active += 1
+        return True
+
+    def release(self, job: ExtractionJob) -> None:
+        """释放任务占用的名额，并计入吞吐量样本"""
+        with self._lock:
+            devices, size = self._job_info.pop(job.job_id, ((), 0))
+            for device in devices:
+                state = self._devices[device]
+                state.active -= 1
+                state.window_bytes += size
+                state.window_jobs += 1
+                if state.window_jobs >= self.sample_jobs:
+                    self._adapt(device, state)
+
+    def forget(self, job: ExtractionJob) -> None:
+        """移除未放行任务的记录，等待中的任务被取消或拒绝时调用"""
+        with self._lock:
+            self._job_info.pop(job.job_id, None)
+
+    def _adapt(self, device: int, state: _DeviceState) -> None:
+        """爬山式调整：吞吐上升继续加并发，下降则减并发"""
+        now = time.monotonic()
+        elapsed = max(now - state.window_start, 1e-6)
+        throughput = state.window_bytes / elapsed
+        previous = state.last_throughput
+        if previous is None or throughput > previous * (1 + self.tolerance):
+            state.limit = min(state.limit + 1, self.max_limit)
+        elif throughput < previous * (1 - self.tolerance):
+            state.limit = max(state.limit - 1, self.min_limit)
+        self.log.info(f"设备 {device} 吞吐 {throughput / 1024 / 1024:.2f}MB/s，并发上限调整为 {state.limit}")
+        state.last_throughput = throughput
+        state.window_bytes = 0
+        state.window_jobs = 0
+        state.window_start = now
+
+    def _state(self, device: int) -> _DeviceState:
+        if device not in self._devices:
+            self._devices[device] = _DeviceState(limit=self.initial_limit)
+        return self._devices[device]
+
+    @staticmethod
+    def _devices_of(job: ExtractionJob) -> Tuple[int, ...]:
+        """输入、输出所在设备，同一设备只计一次"""
+        devices = {DeviceConcurrencyPolicy.device_of(job.input_path),
+                   DeviceConcurrencyPolicy.device_of(job.output_path)}
+        return tuple(sorted(devices))
+
+    @staticmethod
+    def device_of(path: Path) -> int:
+        """路径所在设备号，路径尚不存在时取最近的已存在父目录"""
+        current = Path(path).absolute()
+        while True:
+            try:
+                return os.stat(current).st_dev
+            except OSError:
+                if current.parent == current:
+                    return -1
+                current = current.parent
@@ -0,0 +1,88 @@
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from config.unzip_cinfig import DISK_SAFETY_BYTES, DISK_SAFETY_RATIO, log_file
+from src.core.implement.scheduler.device_policy import DeviceConcurrencyPolicy
+from src.core.implement.unzip.ArchiveLister import ArchiveLister
+from src.exceptions.unzip_excepotion import CompressionError
+from src.models.ExtractionJob import ExtractionJob
+from src.utils.LogDecorator import LogDecorator
+
+
+class DiskSpacePolicy:
+    """
+    磁盘空间准入：解压前读取成员列表得到解压后的总大小，输出设备的可用空间扣除运行中任务的预留量后
+    仍能容纳该任务与安全余量时才放行。运行中任务的预留量在结束前一直计入，已写入的部分会被重复扣除，
+    因此估算偏保守。
+    """
+    log = LogDecorator(__name__, console=False, logfile=str(log_file))
+
+    def __init__(self, margin_ratio: float = DISK_SAFETY_RATIO, margin_bytes: int = DISK_SAFETY_BYTES,
+                 lister: Optional[ArchiveLister] = None):
+        """
+        :param margin_ratio: 按解压大小计算的安全余量比例。
+        :param margin_bytes: 最小安全余量（字节）。
+        :param lister: 读取成员列表的工具，默认首次使用时创建。
+        """
+        self.margin_ratio = margin_ratio
+        self.margin_bytes = margin_bytes
+        self._lister = lister
+        self._lock = threading.Lock()
+        self._reserved: Dict[int, int] = {}  # 设备 -> 运行中任务的预留量
+        self._job_reservations: Dict[int, Tuple[int, int]] = {}  # 任务 -> (设备, 预留量)
+
+    @property
+    def lister(self) -> ArchiveLister:
+        with self._lock:
+            if self._lister is None:
+                self._lister = ArchiveLister()
+            return self._lister
+
+    def inspect(self, job: ExtractionJob) -> None:
+        """读取成员列表并写入 job.listing 与 job.required_bytes，无法读取时按压缩包大小估算"""
+        try:
+            job.listing = self.lister.list(job.input_path, job.password)
+            job.required_bytes = job.listing.total_size
+        except CompressionError as e:
+            job.required_bytes = job.input_size
+            self.log.warning(f"读取成员列表失败，按压缩包大小估算所需空间: {job.input_path}, 错误: {e}")
+
+    def required(self, job: ExtractionJob) -> int:
+        """任务所需空间，包含安全余量"""
+        return job.required_bytes + max(self.margin_bytes, int(job.required_bytes * self.margin_ratio))
+
+    def try_acquire(self, job: ExtractionJob) -> bool:
+        """剩余空间足够时为任务预留空间并返回 True"""
+        device = DeviceConcurrencyPolicy.device_of(job.output_path)
+        required = self.required(job)
+        with self._lock:
+            reserved = self._reserved.get(device, 0)
+            if self.free_space(job.output_path) - reserved < required:
+                return False
+            self._reserved[device] = reserved + required
+            self._job_reservations[job.job_id] = (device, required)
+        return True
+
+    def release(self, job: ExtractionJob) -> None:
+        with self._lock:
+            device, required = self._job_reservations.pop(job.job_id, (None, 0))
+            if device is not None:
+                self._reserved[device] -= required
+
+    def can_ever_fit(self, job: ExtractionJob) -> bool:
+        """输出设备上没有运行中的任务时是否放得下，为 False 时继续等待也无法放行"""
+        device = DeviceConcurrencyPolicy.device_of(job.output_path)
+        with self._lock:
+            if self._reserved.get(device, 0) > 0:
+                return True
+        return self.free_space(job.output_path) >= self.required(job)
+
+    @staticmethod
+    def free_space(path: Path) -> int:
+        """路径所在设备的可用空间，路径尚不存在时取最近的已存在父目录"""
+        current = Path(path).absolute()
+        while not current.exists() and current.parent != current:
+            current = current.parent
+        return shutil.disk_usage(current).free
@@ -0,0 +1,216 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from queue import Queue
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from config.gather_config import COMPRESS
+from config.unzip_cinfig import BOMB_MAX_RATIO, BOMB_MAX_TOTAL_BYTES, RECURSIVE_MAX_DEPTH, log_file
+from src.core.implement.gather.file_gather import FileGather
+from src.core.implement.scheduler.batch_scheduler import BatchScheduler
+from src.core.implement.unzip.ArchiveLister import ArchiveLister
+from src.enumerate.unzip_enum import JobStatus
+from src.exceptions.unzip_excepotion import CompressionError
+from src.models.ArchiveListing import ArchiveListing
+from src.models.ExtractionJob import ExtractionJob
+from src.utils.LogDecorator import LogDecorator
+from src.utils.VolumeIndex import VolumeIndex
+
+
+class RecursiveExtractor:
+    """
+    嵌套解压：每个任务完成后重新收集其输出目录中的压缩包，作为下一层任务提交给同一个调度器，
+    整条嵌套链都经过调度器的并发控制。提交前读取成员列表，解压比或整条链的解压总量超限时拒绝解压。
+    """
+    log = LogDecorator(__name__, console=False, logfile=str(log_file))
+
+    def __init__(self, scheduler: BatchScheduler, max_depth: int = RECURSIVE_MAX_DEPTH,
+                 max_ratio: Optional[float] = BOMB_MAX_RATIO, max_total_bytes: Optional[int] = BOMB_MAX_TOTAL_BYTES,
+                 delete_intermediate: bool = False, types: set = COMPRESS, lister: Optional[ArchiveLister] = None):
+        """
+        :param scheduler: 执行解压的调度器。
+        :param max_depth: 最大嵌套层级，0 表示不解压嵌套的压缩包。
+        :param max_ratio: 解压后大小与压缩包大小之比的上限，None 表示不检查。
+        :param max_total_bytes: 一条嵌套链解压出的总大小上限，None 表示不限制。
+        :param delete_intermediate: 嵌套的压缩包解压成功后是否删除（直接提交的压缩包不会被删除）。
+        :param types: 收集输出目录时识别为压缩包的类型。
+        :param lister: 读取成员列表的工具，默认首次使用时创建。
+        """
+        self.scheduler = scheduler
+        self.max_depth = max_depth
+        self.max_ratio = max_ratio
+        self.max_total_bytes = max_total_bytes
+        self.delete_intermediate = delete_intermediate
+        self.types = types
+        self.rejected: List[Tuple[Path, str]] = []  # 被拒绝解压的压缩包及原因
+        self._lister = lister
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="RecursiveExtractor")
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._outstanding = 0  # 尚未处理完成的任务数，包括收集下一层的过程
+        self._jobs: List[ExtractionJob] = []
+        self._roots: Dict[int, int] = {}  # 任务 -> 嵌套链的根任务
+        self._chain_bytes: Dict[int, int] = {}  # 根任务 -> 整条链已提交的解压总量
+        self._outputs: Set[Path] = set()  # 已分配给嵌套任务的输出目录
+
+    @property
+    def lister(self) -> ArchiveLister:
+        with self._lock:
+            if self._lister is None:
+                self._lister = ArchiveLister()
+            return self._lister
+
+    @property
+    def jobs(self) -> List[ExtractionJob]:
+        with self._lock:
+            return list(self._jobs)
+
+    def submit(self, group, output_path: Optional[Path] = None) -> Optional[ExtractionJob]:
+        """提交顶层分组，被拒绝时返回 None"""
+        return self._admit(group, output_path, None)
+
+    def submit_all(self, groups: Iterable) -> List[ExtractionJob]:
+        return [job for job in (self.submit(group) for group in groups) if job is not None]
+
+    def _admit(self, group, output_path: Optional[Path], parent: Optional[ExtractionJob]) -> Optional[ExtractionJob]:
+        """检查解压比与链总量后提交给调度器，链总量的检查与预留在同一次加锁内完成"""
+        volumes = [Path(group[0])] if isinstance(group, tuple) else [Path(item[0]) for item in group]
+        listing = self._list(volumes[0], parent)
+        unpacked = listing.total_size if listing is not None else 0
+        packed = sum(os.stat(volume).st_size for volume in volumes if volume.exists())
+
+        with self._lock:
+            root_id = self._roots.get(parent.job_id) if parent is not None else None
+            reason = self._check(listing, packed, root_id) if listing is not None else None
+            if reason is not None:
+                self.rejected.append((volumes[0], reason))
+            else:
+                if root_id is not None:
+                    self._chain_bytes[root_id] = self._chain_bytes.get(root_id, 0) + unpacked
+                self._outstanding += 1
+        if reason is not None:
+            self.log.warning(f"拒绝解压: {volumes[0]}, 原因: {reason}")
+            return None
+
+        try:
+            job = self.scheduler.submit(
+                group, output_path, listing=listing,
+                depth=parent.depth + 1 if parent is not None else 0,
+                parent_id=parent.job_id if parent is not None else None
+            )
+        except BaseException:
+            if root_id is not None:
+                with self._lock:
+                    self._chain_bytes[root_id] -= unpacked
+            self._finish()
+            raise
+        with self._lock:
+            self._jobs.append(job)
+            if root_id is None:
+                root_id = job.job_id
+                self._chain_bytes[root_id] = unpacked
+            self._roots[job.job_id] = root_id
+        job.future.add_done_callback(lambda _: self._schedule_done(job))
+        return job
+
+    def _schedule_done(self, job: ExtractionJob) -> None:
+        """在线程池中处理结束的任务，线程池已关闭时直接结束计数，避免 wait() 永久阻塞"""
+        try:
+            self._executor.submit(self._on_done, job)
+        except RuntimeError as e:
+            self.log.warning(f"已关闭，不再处理嵌套压缩包: {job.output_path}, 错误: {e}")
+            self._finish()
+
+    def _list(self, path: Path, parent: Optional[ExtractionJob]) -> Optional[ArchiveListing]:
+        try:
+            return self.lister.list(path, parent.password if parent is not None else self.scheduler.password)
+        except CompressionError as e:
+            self.log.warning(f"读取成员列表失败，跳过压缩炸弹检查: {path}, 错误: {e}")
+            return None
+
+    def _check(self, listing: ArchiveListing, packed: int, root_id: Optional[int]) -> Optional[str]:
+        """返回拒绝原因，通过检查时返回 None，调用方持有锁"""
+        if self.max_ratio is not None and packed and listing.total_size / packed > self.max_ratio:
+            return f"解压比 {listing.total_size / packed:.1f} 超过上限 {self.max_ratio}"
+        if self.max_total_bytes is not None:
+            chain = self._chain_bytes.get(root_id, 0) if root_id is not None else 0
+            if chain + listing.total_size > self.max_total_bytes:
+                return f"嵌套链解压总量 {chain + listing.total_size} 超过上限 {self.max_total_bytes}"
+        return None
+
+    def _on_done(self, job: ExtractionJob) -> None:
+        """任务结束后删除中间压缩包，并收集输出目录中的下一层压缩包"""
+        try:
+            if job.status != JobStatus.DONE:
+                return
+            if self.delete_intermediate and job.depth > 0:
+                for volume in job.volumes:
+                    try:
+                        volume.unlink()
+                    except OSError as e:
+                        self.log.warning(f"删除中间压缩包失败: {volume}, 错误: {e}")
+            if job.depth >= self.max_depth:
+                return
+            # 先完成遍历再提交，避免遍历到子任务新建的输出目录
+            for group in list(self._nested_groups(job.output_path)):
+                self._admit(group, self._child_output([volume for volume, _ in group]), job)
+        except Exception as e:
+            self.log.error(f"处理嵌套压缩包失败: {job.output_path}, 错误: {e}")
+        finally:
+            self._finish()
+
+    def _nested_groups(self, root: Path) -> Iterator[List[Tuple[Path, str]]]:
+        """
+        遍历任务输出目录下的每一层目录（包括同时含有文件与子目录的目录），
+        按分卷集合归组后只识别首个分卷，产出属于 types 的完整分组。
+        """
+        gatherer = FileGather(Queue(), root, self.types)  # 复用类型识别与类型缓存
+        for directory, _, names in os.walk(root):
+            volume_sets = []
+            for volume_set in VolumeIndex.build([Path(directory) / name for name in names]):
+                if volume_set.is_complete:
+                    volume_sets.append(volume_set)
+                else:
+                    self.log.warning(f"嵌套分卷不完整: {volume_set.first}, 缺失: {volume_set.missing}")
+            fctypes = gatherer.get_type_names([volume_set.first for volume_set in volume_sets])
+            for volume_set, fctype in zip(volume_sets, fctypes):
+                if fctype in self.types:
+                    yield [(volume, fctype) for volume in volume_set.volumes]
+
+    def _child_output(self, volumes: List[Path]) -> Path:
+        """嵌套压缩包解压到其所在目录下的同名目录，已存在或已分配给其它任务时追加序号"""
+        first = volumes[0]
+        name = BatchScheduler.output_name(volumes)
+        candidate = first.parent / name
+        count = 1
+        with self._lock:
+            while candidate.exists() or candidate in self._outputs:
+                candidate = first.parent / f"{name}_{count}"
+                count += 1
+            self._outputs.add(candidate)
+        return candidate
+
+    def _finish(self) -> None:
+        with self._idle:
+            self._outstanding -= 1
+            if self._outstanding == 0:
+                self._idle.notify_all()
+
+    def wait(self, timeout: Optional[float] = None) -> List[ExtractionJob]:
+        """等待全部层级的任务结束"""
+        with self._idle:
+            self._idle.wait_for(lambda: self._outstanding == 0, timeout)
+        return self.jobs
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+if __name__ == '__main__':
+    with BatchScheduler(r"E:\解压输出", max_jobs=4) as batch:
+        extractor = RecursiveExtractor(batch, delete_intermediate=True)
+        extractor.submit_all(FileGather(Queue(), r"E:\下载文件\百度网盘下载文件\15").stream_collection())
+        for finished in extractor.wait():
+            print(finished.depth, finished.status, finished.input_path)
+        extractor.shutdown()
@@ -0,0 +1,170 @@
+import re
+import subprocess
+import tarfile
+import time
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import py7zr
+
+from src.exceptions.unzip_excepotion import CompressionError
+from src.models.ArchiveListing import ArchiveListing
+from src.models.ArchiveMember import ArchiveMember
+
+_SPLIT_VOLUME = re.compile(r"\.(\d{3,}|z\d{2,})$", re.IGNORECASE)
+
+
+class ArchiveLister:
+    """
+    不解压读取压缩包的成员列表：7z 可用时使用 7z l -slt（支持 rar、iso、cab 与分卷），
+    否则使用 zipfile / tarfile / py7zr 在进程内读取。
+    """
+
+    def __init__(self, use_7z: Optional[bool] = None):
+        """
+        :param use_7z: 是否使用 7z，默认在 7z 可用时使用。
+        """
+        if use_7z is None:
+            from src.factories.JudgementSoftware import SevenZipFactory
+            use_7z = SevenZipFactory.is_available()
+        self.use_7z = use_7z
+
+    def list(self, path: Union[Path, str], password: Optional[str] = None) -> ArchiveListing:
+        path = Path(path)
+        if self.use_7z:
+            return self._list_7z(path, password)
+        return self._list_python(path, password)
+
+    def _list_7z(self, path: Path, password: Optional[str]) -> ArchiveListing:
+        cmd = ["7z", "l", "-slt", "-y"]
+        if password:
+            cmd.append("-p" + password)
+        cmd.append(str(path))
+        return self.parse_slt(path, self._run(cmd))
+
+    @staticmethod
+    def _run(command: List[str]) -> str:
+        """执行 7z l 命令并返回标准输出，失败时抛出 CompressionError"""
+        try:
+            result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                    encoding="gbk", errors="replace")
+        except OSError as e:
+            raise CompressionError(f"找不到命令：{command[0]}") from e
+        if result.returncode != 0:
+            error_msg = f"命令执行失败，返回码：{result.returncode}"
+            if result.stderr.strip():
+                error_msg += f"\n错误信息：{result.stderr.strip()}"
+            raise CompressionError(error_msg)
+        return result.stdout.strip()
+
+    @staticmethod
+    def parse_slt(path: Path, output: str) -> ArchiveListing:
+        """解析 7z l -slt 的输出，成员信息位于 ---------- 分隔行之后，以空行分隔"""
+        listing = ArchiveListing(path=path)
+        header, separator, body = output.partition("\n----------")
+        if not separator:
+            raise CompressionError(f"无法解析成员列表：{path}")
+        archive_type = ArchiveLister._fields(header).get("Type")
+        listing.archive_type = archive_type.lower() if archive_type else None
+
+        for block in re.split(r"\n\s*\n", body):
+            fields = ArchiveLister._fields(block)
+            if "Path" not in fields:
+                continue
+            attributes = fields.get("Attributes", "")
+            listing.members.append(ArchiveMember(
+                path=fields["Path"],
+                size=ArchiveLister._int(fields.get("Size")) or 0,
+                packed_size=ArchiveLister._int(fields.get("Packed Size")),
+                crc=ArchiveLister._int(fields.get("CRC"), 16),
+                mtime=ArchiveLister._timestamp(fields.get("Modified")),
+                is_dir=fields.get("Folder") == "+" or attributes.startswith("D")
+            ))
+        return listing
+
+    @staticmethod
+    def _fields(block: str) -> Dict[str, str]:
+        fields = {}
+        for line in block.splitlines():
+            key, separator, value = line.partition(" = ")
+            if separator:
+                fields[key.strip()] = value.strip()
+        return fields
+
+    @staticmethod
+    def _int(value: Optional[str], base: int = 10) -> Optional[int]:
+        try:
+            return int(value, base) if value else None
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _timestamp(value: Optional[str]) -> Optional[float]:
+        """7z 输出形如 2020-01-01 08:00:00 或带小数秒，按本地时间解析"""
+        if not value:
+            return None
+        try:
+            return datetime.strptime(value[:19], "%Y-%m-%d %H:%M:%S").timestamp()
+        except ValueError:
+            return None
+
+    def _list_python(self, path: Path, password: Optional[str]) -> ArchiveListing:
+        if _SPLIT_VOLUME.search(path.name):
+            raise CompressionError(f"进程内读取不支持分卷压缩包：{path}")
+        try:
+            if py7zr.is_7zfile(path):
+                return ArchiveListing(path=path, archive_type="7z", members=self._members_7z(path, password))
+            if zipfile.is_zipfile(path):
+                return ArchiveListing(path=path, archive_type="zip", members=self._members_zip(path))
+            if tarfile.is_tarfile(path):
+                return ArchiveListing(path=path, archive_type="tar", members=self._members_tar(path))
+        except CompressionError:
+            raise
+        except Exception as e:
+            raise CompressionError(f"读取成员列表失败：{path}，错误：{e}") from e
+        raise CompressionError(f"进程内读取不支持该格式：{path}")
+
+    @staticmethod
+    def _members_zip(path: Path) -> List[ArchiveMember]:
+        with zipfile.ZipFile(path) as archive:
+            return [
+                ArchiveMember(
+                    path=info.filename.rstrip("/"),
+                    size=info.file_size,
+                    packed_size=info.compress_size,
+                    crc=info.CRC,
+                    mtime=time.mktime(info.date_time + (0, 0, -1)),
+                    is_dir=info.is_dir()
+                )
+                for info in archive.infolist()
+            ]
+
+    @staticmethod
+    def _members_tar(path: Path) -> List[ArchiveMember]:
+        with tarfile.open(path) as archive:
+            return [
+                ArchiveMember(path=info.name, size=info.size, mtime=float(info.mtime), is_dir=info.isdir())
+                for info in archive.getmembers()
+            ]
+
+    @staticmethod
+    def _members_7z(path: Path, password: Optional[str]) -> List[ArchiveMember]:
+        with py7zr.SevenZipFile(path, mode="r", password=password) as archive:
+            return [
+                ArchiveMember(
+                    path=info.filename,
+                    size=info.uncompressed or 0,
+                    packed_size=info.compressed,
+                    crc=info.crc32,
+                    mtime=info.creationtime.timestamp() if info.creationtime else None,
+                    is_dir=info.is_directory
+                )
+                for info in archive.list()
+            ]
+
+
+if __name__ == '__main__':
+    result = ArchiveLister().list(r"E:\下载文件\a.zip")
+    print(result.archive_type, result.file_count, result.total_size)
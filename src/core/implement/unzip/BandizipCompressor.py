@@ -1,5 +1,6 @@
 from typing import List
 
+from config.unzip_cinfig import COMMAND_LINE_LIMIT
 from src.core.interfaces.unzip_interfaces import CompressionTool
 from src.exceptions.unzip_excepotion import CompressionError
 
@@ -31,11 +32,24 @@ class BandizipCompressor(CompressionTool):
         if self._config.compression_type:
             cmd.append(f"-fmt:{self._config.compression_type}")
 
-        cmd.append(self._config.output_path)
-        cmd.append(self._config.input_path)
+        cmd.extend(self._tuning_args())
+
+        # Bandizip 不支持列表文件，多个输入直接追加到命令行
+        cmd.append(str(self._config.output_path))
+        cmd.extend(self._input_paths())
+        if sum(len(arg) + 1 for arg in cmd) > COMMAND_LINE_LIMIT:
+            raise CompressionError(f"输入文件过多，命令行超过 {COMMAND_LINE_LIMIT} 个字符，请改用 7z 或 WinRAR 压缩")
         self.log.info("构建命令：" + " ".join(cmd))
         return cmd
 
+    def _tuning_args(self) -> List[str]:
+        """Bandizip 命令行只支持压缩等级，其余参数忽略"""
+        config = self._config
+        ignored = [name for name in ("threads", "dictionary", "solid_block", "method") if getattr(config, name)]
+        if ignored:
+            self.log.warning(f"Bandizip 不支持以下压缩参数，已忽略: {', '.join(ignored)}")
+        return [f"-l:{config.level}"] if config.level is not None else []
+
 if __name__ == '__main__':
     compressor = BandizipCompressor()
     compressor.set_input_path("D:\\test.txt")\
@@ -31,12 +31,14 @@ class BandizipDecompressor(DecompressionTool):
             List[str]: 构建好的命令列表
 
         Raises:
-            DecompressionError: 当缺少必要参数时抛出
+            DecompressionError: 当缺少必要参数或设置了排除成员时抛出
         """
         if not self._config.input_path:
             raise DecompressionError("未指定输入文件")
         if not self._config.output_path:
             raise DecompressionError("未指定输出目录")
+        if self._config.exclude:
+            raise DecompressionError("Bandizip 不支持排除成员")
 
         cmd = ["bandizip", "x", "-y"]
 
@@ -49,6 +51,8 @@ class BandizipDecompressor(DecompressionTool):
             str(self._config.input_path),
             "-o:" + str(self._config.output_path)
         ])
+        # Bandizip 不支持列表文件，只解压的成员逐个跟在压缩包之后
+        cmd.extend(self._config.include)
 
         self.log.info("构建命令：" + " ".join(cmd))
         return cmd
@@ -0,0 +1,278 @@
+import asyncio
+import fnmatch
+import heapq
+import os
+import re
+import tarfile
+import threading
+import zipfile
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, List, Optional, Set
+
+import py7zr
+from py7zr import DecompressionError
+
+from config.unzip_cinfig import PY_EXTRACT_PARALLEL_MIN_MEMBERS, PY_EXTRACT_WORKERS, STREAM_TAIL_LINES
+from src.core.interfaces.unzip_interfaces import DecompressionTool
+from src.exceptions.unzip_excepotion import CompressionError, ExecutionTimeoutError, TerminationError
+from src.models.ProgressEvent import ProgressEvent
+
+_SPLIT_VOLUME = re.compile(r"\.(\d{3,}|z\d{2,})$", re.IGNORECASE)
+
+
+class _ProgressTracker:
+    """汇总各线程的解压进度并回调 ProgressEvent"""
+
+    def __init__(self, total_bytes: int, on_progress: Optional[Callable[[ProgressEvent], None]]):
+        self.total_bytes = total_bytes
+        self.on_progress = on_progress
+        self.files_done = 0
+        self.bytes_done = 0
+        self._lock = threading.Lock()
+
+    def advance(self, name: str, size: int) -> None:
+        with self._lock:
+            self.files_done += 1
+            self.bytes_done += size
+            event = ProgressEvent(
+                percent=self.bytes_done * 100 // self.total_bytes if self.total_bytes else 100,
+                files_done=self.files_done,
+                bytes_done=self.bytes_done,
+                current_file=name,
+                raw=name
+            )
+        if self.on_progress is not None:
+            self.on_progress(event)
+
+
+class PythonDecompressor(DecompressionTool):
+    """
+    进程内解压实现类：使用 zipfile / tarfile / py7zr 解压，不启动子进程。
+    zip 的成员按大小分配到多个线程，每个线程持有独立的文件句柄；
+    tar 为顺序流只能逐个解压；7z 由 py7zr 一次性解压，开始后无法中途终止。
+    """
+
+    def __init__(self, max_workers: int = PY_EXTRACT_WORKERS):
+        super().__init__(max_workers)
+        self.member_workers = max_workers
+        self.delete = False
+        self._stop_events: Set[threading.Event] = set()  # 运行中解压任务的终止标记
+
+    def set_delete_after_extraction(self, delete: bool) -> 'PythonDecompressor':
+        """设置解压后是否删除原文件"""
+        self.delete = delete
+        return self
+
+    def _build_command(self) -> List[str]:
+        """校验参数，进程内解压不执行命令，返回值仅用于日志"""
+        if not self._config.input_path:
+            raise DecompressionError("未指定输入文件")
+        if not self._config.output_path:
+            raise DecompressionError("未指定输出目录")
+
+        cmd = ["python", "x", str(self._config.input_path), "-o" + str(self._config.output_path)]
+        self.log.info(f"构建命令：{cmd}")
+        return cmd
+
+    def execute(self) -> str:
+        """同步执行"""
+        return self._extract(None)
+
+    async def async_execute(self, timeout: Optional[float] = None) -> str:
+        """在线程池中解压，超时或任务被取消时终止解压并等待线程退出"""
+        future = asyncio.get_running_loop().run_in_executor(self.thread_executor, self.execute)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            self.terminate_process()
+            await asyncio.gather(future, return_exceptions=True)
+            raise ExecutionTimeoutError(f"解压超时（{timeout}秒）：{self._config.input_path}")
+        except asyncio.CancelledError:
+            self.terminate_process()
+            await asyncio.gather(future, return_exceptions=True)
+            raise
+
+    def thread_execute(self):
+        """多线程执行"""
+        return self.thread_executor.submit(self.execute)
+
+    def execute_stream(self, on_progress: Optional[Callable[[ProgressEvent], None]] = None,
+                       tail_lines: int = STREAM_TAIL_LINES, on_start: Optional[Callable[[object], None]] = None) -> str:
+        """流式执行，每解压完一个成员回调一次进度，on_start 以本次解压的终止标记回调"""
+        return self._extract(on_progress, on_start)
+
+    def _terminate_handle(self, handle) -> None:
+        """只终止句柄对应的解压"""
+        handle.set()
+
+    def terminate_process(self):
+        """终止全部运行中的解压，已开始的成员写完后退出，已开始的 7z 解压会执行到结束"""
+        with self._process_lock:
+            for stop in self._stop_events:
+                stop.set()
+
+    def _extract(self, on_progress: Optional[Callable[[ProgressEvent], None]],
+                 on_start: Optional[Callable[[object], None]] = None) -> str:
+        self._build_command()
+        source = Path(self._config.input_path)
+        target = Path(self._config.output_path)
+        if _SPLIT_VOLUME.search(source.name):
+            raise CompressionError(f"进程内解压不支持分卷压缩包：{source}")
+
+        stop = threading.Event()
+        with self._process_lock:
+            self._stop_events.add(stop)
+            if self.cancel_requested is not None and self.cancel_requested():
+                stop.set()  # 开始解压前已请求取消
+        if on_start is not None:
+            on_start(stop)
+        try:
+            target.mkdir(parents=True, exist_ok=True)
+            if py7zr.is_7zfile(source):
+                count = self._extract_7z(source, target, stop, on_progress)
+            elif zipfile.is_zipfile(source):
+                count = self._extract_zip(source, target, stop, on_progress)
+            elif tarfile.is_tarfile(source):
+                count = self._extract_tar(source, target, stop, on_progress)
+            else:
+                raise CompressionError(f"进程内解压不支持该格式：{source}")
+            if stop.is_set():
+                raise TerminationError("终止")
+        except (TerminationError, CompressionError):
+            raise
+        except Exception as e:
+            raise CompressionError(f"解压失败：{source}，错误：{e}") from e
+        finally:
+            with self._process_lock:
+                self._stop_events.discard(stop)
+
+        if self.delete:
+            os.remove(source)
+        return f"解压完成：{source} -> {target}，共 {count} 个文件"
+
+    def _extract_zip(self, source: Path, target: Path, stop: threading.Event,
+                     on_progress: Optional[Callable[[ProgressEvent], None]]) -> int:
+        members = []
+        selective = bool(self._config.include or self._config.exclude)
+        with zipfile.ZipFile(source) as archive:
+            for info in archive.infolist():
+                if info.is_dir():
+                    if not selective:
+                        archive.extract(info, target)
+                elif self._selected(info.filename):
+                    members.append(info)
+        password = self._config.password.encode() if self._config.password else None
+        tracker = _ProgressTracker(sum(info.file_size for info in members), on_progress)
+
+        chunks = self._partition(members, self.member_workers)
+        if len(members) < PY_EXTRACT_PARALLEL_MIN_MEMBERS or len(chunks) < 2:
+            self._extract_zip_chunk(source, members, target, password, stop, tracker)
+            return len(members)
+
+        with ThreadPoolExecutor(max_workers=len(chunks), thread_name_prefix="PythonDecompressor") as pool:
+            futures = [
+                pool.submit(self._extract_zip_chunk, source, chunk, target, password, stop, tracker)
+                for chunk in chunks
+            ]
+            done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in done:
+                if future.exception() is not None:
+                    stop.set()  # 任一线程出错时通知其余线程退出
+                    raise future.exception()
+        return len(members)
+
+    def _selected(self, name: str) -> bool:
+        """按 include / exclude 通配符判断成员是否需要解压"""
+        path = name.replace("\\", "/").rstrip("/")
+        base = path.rsplit("/", 1)[-1]
+
+        def matches(pattern: str) -> bool:
+            if self._is_name_pattern(pattern):
+                return fnmatch.fnmatchcase(base, pattern)
+            # 与 7z 一致，含路径的通配符不跨目录层级匹配
+            pattern = pattern.replace("\\", "/")
+            return path.count("/") == pattern.count("/") and fnmatch.fnmatchcase(path, pattern)
+
+        if self._config.include and not any(matches(pattern) for pattern in self._config.include):
+            return False
+        return not any(matches(pattern) for pattern in self._config.exclude)
+
+    @staticmethod
+    def _extract_zip_chunk(source: Path, members: List[zipfile.ZipInfo], target: Path, password: Optional[bytes],
+                           stop: threading.Event, tracker: _ProgressTracker) -> None:
+        """每个线程打开独立的句柄，避免共享文件偏移"""
+        with zipfile.ZipFile(source) as archive:
+            for info in members:
+                if stop.is_set():
+                    return
+                archive.extract(info, target, pwd=password)
+                tracker.advance(info.filename, info.file_size)
+
+    @staticmethod
+    def _partition(members: List[zipfile.ZipInfo], workers: int) -> List[List[zipfile.ZipInfo]]:
+        """按压缩后大小将成员均衡分配到各线程，大文件优先分配"""
+        workers = max(1, min(workers, len(members)))
+        heap = [(0, index) for index in range(workers)]
+        chunks: List[List[zipfile.ZipInfo]] = [[] for _ in range(workers)]
+        for info in sorted(members, key=lambda item: item.compress_size, reverse=True):
+            load, index = heapq.heappop(heap)
+            chunks[index].append(info)
+            heapq.heappush(heap, (load + info.compress_size, index))
+        return [chunk for chunk in chunks if chunk]
+
+    def _extract_tar(self, source: Path, target: Path, stop: threading.Event,
+                     on_progress: Optional[Callable[[ProgressEvent], None]]) -> int:
+        """tar 只能顺序读取，逐个成员解压"""
+        # 支持 extraction filter 的版本使用 data 过滤器，拒绝越界路径与特殊文件
+        options = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+        count = 0
+        with tarfile.open(source) as archive:
+            selective = bool(self._config.include or self._config.exclude)
+            members = [member for member in archive.getmembers()
+                       if (not selective if member.isdir() else self._selected(member.name))]
+            tracker = _ProgressTracker(sum(member.size for member in members if member.isfile()), on_progress)
+            for member in members:
+                if stop.is_set():
+                    break
+                if not options:
+                    self._check_tar_member(member, target)
+                archive.extract(member, target, **options)
+                if member.isfile():
+                    count += 1
+                    tracker.advance(member.name, member.size)
+        return count
+
+    @staticmethod
+    def _check_tar_member(member: tarfile.TarInfo, target: Path) -> None:
+        """不支持 extraction filter 时手动拒绝越界路径"""
+        root = target.resolve()
+        destination = (root / member.name).resolve()
+        if destination != root and root not in destination.parents:
+            raise CompressionError(f"压缩包成员路径越界：{member.name}")
+        if member.issym() or member.islnk():
+            link = (destination.parent / member.linkname).resolve()
+            if root not in link.parents:
+                raise CompressionError(f"压缩包成员链接越界：{member.name} -> {member.linkname}")
+
+    def _extract_7z(self, source: Path, target: Path, stop: threading.Event,
+                    on_progress: Optional[Callable[[ProgressEvent], None]]) -> int:
+        """py7zr 在一次调用中解压全部成员，终止只在开始前生效，整体完成后回调一次进度"""
+        with py7zr.SevenZipFile(source, mode="r", password=self._config.password) as archive:
+            members = [info for info in archive.list() if not info.is_directory and self._selected(info.filename)]
+            if stop.is_set():
+                return 0
+            if self._config.include or self._config.exclude:
+                archive.extract(path=target, targets=[info.filename for info in members])
+            else:
+                archive.extractall(path=target)
+        if on_progress is not None:
+            on_progress(ProgressEvent(percent=100, files_done=len(members),
+                                      bytes_done=sum(info.uncompressed for info in members), raw=source.name))
+        return len(members)
+
+
+if __name__ == '__main__':
+    decompressor = PythonDecompressor()
+    decompressor.set_input_path("D:\\test.zip").set_output_path("D:\\test")
+    print(decompressor.execute())
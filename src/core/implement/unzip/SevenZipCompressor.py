@@ -1,7 +1,9 @@
-from typing import List
+from typing import List, Optional
 
 from src.core.interfaces.unzip_interfaces import CompressionTool
 from src.exceptions.unzip_excepotion import CompressionError
+from src.models.ProgressEvent import ProgressEvent
+from src.utils.ProgressParser import ProgressParser
 
 
 class SevenZipCompressor(CompressionTool):
@@ -38,17 +40,50 @@ class SevenZipCompressor(CompressionTool):
         # 添加压缩类型
         command.append(f"-t{self.config.compression_type}")
 
+        # 添加压缩等级、线程数等参数
+        command.extend(self._tuning_args())
+
+        # 添加输入文件/目录，数量较多时通过列表文件传入，列表文件按 UTF-8 读取
+        input_args = self._input_args(lambda path: "@" + path)
+        if input_args[0].startswith("@"):
+            command.append("-scsUTF-8")
+
         # 添加输出路径
         command.append(str(self.config.output_path))
-
-        # 添加输入文件/目录
-        input_paths = self.config.input_path if isinstance(self.config.input_path, list) else [self.config.input_path]
-        for path in input_paths:
-            command.append(str(path))
+        command.extend(input_args)
 
         self.log.info(f"构建7z命令: {' '.join(command)}")
         return command
 
+    def _tuning_args(self) -> List[str]:
+        """压缩参数，字典与固实块只对 7z 格式生效，压缩算法按格式使用 -m0= 或 -mm="""
+        config = self.config
+        args = []
+        if config.level is not None:
+            args.append(f"-mx{config.level}")
+        if config.threads is not None:
+            args.append(f"-mmt{config.threads}")
+        if config.compression_type == "7z":
+            if config.method:
+                args.append(f"-m0={config.method}")
+            if config.dictionary:
+                args.append(f"-md={config.dictionary}")
+            if config.solid_block:
+                args.append(f"-ms={config.solid_block}")
+        else:
+            if config.method:
+                args.append(f"-mm={config.method}")
+            if config.dictionary or config.solid_block:
+                self.log.warning(f"{config.compression_type} 格式不支持字典与固实块设置，已忽略")
+        return args
+
+    def _progress_switches(self) -> List[str]:
+        """-bsp1 将进度输出到标准输出，-bso0 关闭逐文件列表以减少输出量"""
+        return ["-bsp1", "-bso0"]
+
+    def _parse_progress(self, line: str) -> Optional[ProgressEvent]:
+        return ProgressParser.parse_7z(line)
+
 
 if __name__ == '__main__':
     compressor = SevenZipCompressor()
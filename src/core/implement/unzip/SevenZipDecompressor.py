@@ -1,8 +1,10 @@
-from typing import List
+from typing import List, Optional
 
 from py7zr import DecompressionError
 
 from src.core.interfaces.unzip_interfaces import DecompressionTool
+from src.models.ProgressEvent import ProgressEvent
+from src.utils.ProgressParser import ProgressParser
 
 
 class SevenZipDecompressor(DecompressionTool):
@@ -31,10 +33,30 @@ class SevenZipDecompressor(DecompressionTool):
             cmd.extend(["-p" + self._config.password])
 
         cmd.extend([str(self._config.input_path), "-o" + str(self._config.output_path)])
+        cmd.extend(self._selection_args())
         self.log.info(f"构建命令：{cmd}")
 
         return cmd
 
+    def _selection_args(self) -> List[str]:
+        """-i/-x 选择成员，文件名通配符使用递归匹配（r），列表文件按 UTF-8 读取"""
+        args = []
+        for switch, patterns in (("-i", self._config.include), ("-x", self._config.exclude)):
+            names = [pattern for pattern in patterns if self._is_name_pattern(pattern)]
+            paths = [pattern for pattern in patterns if not self._is_name_pattern(pattern)]
+            args += self._pattern_args(names, lambda pattern: f"{switch}r!{pattern}", lambda path: f"{switch}r@{path}")
+            args += self._pattern_args(paths, lambda pattern: f"{switch}!{pattern}", lambda path: f"{switch}@{path}")
+        if args:
+            args.append("-scsUTF-8")
+        return args
+
+    def _progress_switches(self) -> List[str]:
+        """-bsp1 将进度输出到标准输出，-bso0 关闭逐文件列表以减少输出量"""
+        return ["-bsp1", "-bso0"]
+
+    def _parse_progress(self, line: str) -> Optional[ProgressEvent]:
+        return ProgressParser.parse_7z(line)
+
 
 if __name__ == '__main__':
     decompressor = SevenZipDecompressor()
@@ -46,12 +46,35 @@ class WinRarCompressor(CompressionTool):
         if self.delete:
             command.append("-df")
 
+        command.extend(self._tuning_args())
+
+        # 输入文件较多时通过列表文件传入，列表文件按 UTF-8 读取
+        input_args = self._input_args(lambda path: "@" + path)
+        if input_args[0].startswith("@"):
+            command.append("-scfl")
+
         command.append(f"{str(self._config.output_path)}")
-        command.append(self._config.input_path)
+        command.extend(input_args)
 
         self.log.info(f"构建命令：{command}")
         return command
 
+    def _tuning_args(self) -> List[str]:
+        """压缩参数：等级 0-9 换算为 WinRAR 的 -m0 至 -m5，固实压缩只区分开关，不支持指定压缩算法"""
+        config = self._config
+        args = []
+        if config.level is not None:
+            args.append(f"-m{round(config.level * 5 / 9)}")
+        if config.threads is not None:
+            args.append(f"-mt{config.threads}")
+        if config.dictionary:
+            args.append(f"-md{config.dictionary}")
+        if config.solid_block:
+            args.append("-s-" if config.solid_block == "off" else "-s")
+        if config.method:
+            self.log.warning(f"WinRAR 不支持指定压缩算法，已忽略: {config.method}")
+        return args
+
 if __name__ == '__main__':
     compressor = WinRarCompressor()
     compressor.set_input_path("D:\\test.txt").set_password("123456")\
@@ -41,6 +41,11 @@ class WinRarDecompressor(DecompressionTool):
             cmd.append("-df")
         if self._config.password:
             cmd.extend(["-p" + self._config.password])
+        # -n 只包含、-x 排除，列表文件按 UTF-8 读取
+        cmd.extend(self._pattern_args(self._config.include, lambda mask: "-n" + mask, lambda path: "-n@" + path))
+        cmd.extend(self._pattern_args(self._config.exclude, lambda mask: "-x" + mask, lambda path: "-x@" + path))
+        if self._config.include or self._config.exclude:
+            cmd.append("-scfl")
 
         cmd.extend([
             str(self._config.input_path),
@@ -1,26 +1,62 @@
+import os
+import threading
 from logging import WARNING
 from abc import ABC, abstractmethod
 from pathlib import Path
-from queue import Queue
-from typing import Union, Optional
+from queue import Empty, Full, Queue
+from typing import Union, Optional, List
 
 from magika import magika
 
-from config.gather_config import COMPRESS
+from config.gather_config import COMPRESS, IDENTIFY_BATCH_SIZE, STREAM_PUT_TIMEOUT, TYPE_CACHE_FILE, \
+    TYPE_CACHE_MAX_ENTRIES
 from config.unzip_cinfig import log_file
 from src.enumerate.gather_enum import Mode
+from src.models.DirectoryScan import DirectoryScan
+from src.utils.FileSignature import FileSignature
+from src.utils.FileTypeCache import CacheKey, FileTypeCache
 from src.utils.LogDecorator import LogDecorator
+from src.utils.ScanEngine import ScanEngine
+
+END_OF_STREAM = object()  # 流式收集结束哨兵
 
 
 class GatherInterfaces(ABC):
     log = LogDecorator(__name__, level=WARNING, logfile=log_file)
+    _magika_model: Optional[magika.Magika] = None  # 进程内共享的模型实例，首次识别时加载
+    _magika_lock = threading.Lock()
 
     def __init__(self, queue: Queue, path: Optional[Union[Path, str]] = None, types: set = COMPRESS):
         self.queue = queue
         self.path = self._validate_path(path)
         self.type = types
-        self.__magika_obj = magika.Magika()
-        self._should_stop = False  # 新增停止标志
+        self._stop_event = threading.Event()  # 停止标志
+        self._streaming = False  # 是否由 stream_collection 的后台线程执行收集
+        self._stream_error: Optional[Exception] = None  # 流式收集时后台线程抛出的异常
+        self.batch_size = IDENTIFY_BATCH_SIZE  # 批量识别文件类型的批大小
+        self.type_cache: Optional[FileTypeCache] = (
+            FileTypeCache.shared(TYPE_CACHE_FILE, TYPE_CACHE_MAX_ENTRIES) if TYPE_CACHE_FILE else None
+        )  # 持久化文件类型缓存
+
+    @classmethod
+    def get_magika(cls) -> magika.Magika:
+        """获取共享的 Magika 模型实例，首次调用时加载模型（线程安全）"""
+        if cls._magika_model is None:
+            with cls._magika_lock:
+                if cls._magika_model is None:
+                    GatherInterfaces._magika_model = magika.Magika()
+        return cls._magika_model
+
+    @classmethod
+    def preload_model(cls) -> None:
+        """在服务启动时显式加载模型，避免首次识别时的加载延迟"""
+        cls.get_magika()
+
+    def set_batch_size(self, batch_size: int):
+        """设置批量识别的批大小，1 表示逐个识别"""
+        if batch_size < 1:
+            raise ValueError("批大小必须大于0")
+        self.batch_size = batch_size
 
     def set_type(self, types: set):
         self.type = types
@@ -34,19 +70,108 @@ class GatherInterfaces(ABC):
     def get_path(self) -> Path:
         return self.path
 
+    def set_type_cache(self, type_cache: Optional[FileTypeCache]):
+        """设置文件类型缓存，传入 None 关闭缓存"""
+        self.type_cache = type_cache
+
     def get_type_name(self, path: Path) -> str:
         """
-        获取文件类型。
+        获取文件类型，依次尝试文件类型缓存、文件头魔数识别，最后调用模型识别。
         :param path: 文件路径。
         :return: 文件类型字符串。
         @rtype: object
         """
+        key = self._cache_key(path)
+        if key is not None:
+            label = self.type_cache.get(key)
+            if label is not None:
+                return label
+        label = FileSignature.sniff(path) or self._infer_type_name(path)
+        if key is not None:
+            self.type_cache.put(key, label)
+        return label
+
+    def _infer_type_name(self, path: Path) -> str:
+        """调用模型识别单个文件类型"""
         try:
-            file_type = self.__magika_obj.identify_path(path)
+            file_type = self.get_magika().identify_path(path)
             return file_type.dl.ct_label
         except magika.MagikaError as e:
             raise RuntimeError(f"识别文件类型失败，错误原因：{e}")
 
+    def get_type_names(self, paths: List[Path]) -> List[Optional[str]]:
+        """
+        批量获取文件类型，缓存未命中且文件头魔数无法确定的文件按 batch_size 分批调用一次模型推理。
+        批量识别失败时回退为逐个识别，单个文件识别失败时对应位置为 None。
+        :param paths: 文件路径列表。
+        :return: 与 paths 一一对应的文件类型列表。
+        """
+        keys = [self._cache_key(path) for path in paths]
+        labels: List[Optional[str]] = [None] * len(paths)
+        if self.type_cache is not None:
+            hits = self.type_cache.get_many([key for key in keys if key is not None])
+            hit_iter = iter(hits)
+            for index, key in enumerate(keys):
+                if key is not None:
+                    labels[index] = next(hit_iter)
+
+        misses = [index for index, label in enumerate(labels) if label is None]
+        sniffed = []
+        for index in misses:
+            labels[index] = FileSignature.sniff(paths[index])
+            if labels[index] is not None:
+                sniffed.append(index)
+        self._store_labels(keys, labels, sniffed)
+
+        # 魔数无法确定的文件交给模型批量识别
+        misses = [index for index in misses if labels[index] is None]
+        for start in range(0, len(misses), self.batch_size):
+            if self._should_stop:
+                break
+            batch = misses[start:start + self.batch_size]
+            batch_labels = self._identify_batch([paths[index] for index in batch])
+            for index, label in zip(batch, batch_labels):
+                labels[index] = label
+            self._store_labels(keys, labels, batch)
+        return labels
+
+    def _store_labels(self, keys: List[Optional[CacheKey]], labels: List[Optional[str]], indexes: List[int]):
+        """将识别结果写入文件类型缓存"""
+        if self.type_cache is None:
+            return
+        self.type_cache.put_many([
+            (keys[index], labels[index])
+            for index in indexes
+            if keys[index] is not None and labels[index] is not None
+        ])
+
+    def _identify_batch(self, batch: List[Path]) -> List[Optional[str]]:
+        """识别一批文件，失败时逐个回退"""
+        if len(batch) > 1:
+            try:
+                results = self.get_magika().identify_paths(batch)
+                return [result.dl.ct_label for result in results]
+            except Exception as e:
+                self.log.warning(f"批量识别失败，回退为逐个识别: {e}")
+
+        labels: List[Optional[str]] = []
+        for path in batch:
+            try:
+                labels.append(self._infer_type_name(path))
+            except Exception as e:
+                self.log.error(f"文件类型识别失败: {path}, 错误: {e}")
+                labels.append(None)
+        return labels
+
+    def _cache_key(self, path: Path) -> Optional[CacheKey]:
+        """获取文件的缓存键，未启用缓存或 stat 失败时返回 None"""
+        if self.type_cache is None:
+            return None
+        try:
+            return FileTypeCache.key_of(os.stat(path))
+        except OSError:
+            return None
+
     @staticmethod
     def _validate_path(path: Union[Path, str]) -> Path:
         """验证路径有效性并返回Path对象"""
@@ -65,32 +190,94 @@ class GatherInterfaces(ABC):
 
     def get_collection(self):
         while not self.queue.empty():
-            yield self.queue.get()
+            item = self.queue.get()
+            if item is END_OF_STREAM:
+                return
+            yield item
+
+    def stream_collection(self):
+        """
+        流式收集：在后台线程中遍历，每发现一个分组立即产出。
+        队列设置 maxsize 时，消费过慢会阻塞遍历线程形成背压；遍历结束以 END_OF_STREAM 哨兵标记。
+        消费方提前退出时自动停止遍历。
+        """
+        if self.queue.maxsize <= 0:
+            self.log.warning("队列未设置容量上限，流式收集将无法形成背压")
+        # 停止事件在启动后台线程前创建，后台线程不再重置，启动前后发出的停止请求都不会丢失
+        self._stop_event = threading.Event()
+        self._streaming = True
+        self._stream_error = None
+        worker = threading.Thread(target=self._stream_worker, name=f"{self.__class__.__name__}-stream", daemon=True)
+        worker.start()
+        finished = False
+        try:
+            while True:
+                item = self.queue.get()
+                if item is END_OF_STREAM:
+                    finished = True
+                    break
+                yield item
+            if self._stream_error is not None:
+                raise self._stream_error
+        finally:
+            if not finished:
+                # 消费方提前退出：停止遍历并排空队列，避免遍历线程阻塞在 put 上
+                self.stop_collection()
+                while worker.is_alive() or not self.queue.empty():
+                    try:
+                        if self.queue.get(timeout=STREAM_PUT_TIMEOUT) is END_OF_STREAM:
+                            break
+                    except Empty:
+                        continue
+            worker.join()
+            self._streaming = False
+
+    def _stream_worker(self) -> None:
+        """后台遍历线程"""
+        try:
+            self.start_collection()
+        except Exception as e:
+            self._stream_error = e
+        finally:
+            self.queue.put(END_OF_STREAM)
+
+    def _put(self, item) -> bool:
+        """
+        放入队列，队列已满时阻塞等待，期间响应停止标志。
+        :return: 是否成功入队。
+        """
+        while not self._should_stop:
+            try:
+                self.queue.put(item, timeout=STREAM_PUT_TIMEOUT)
+                return True
+            except Full:
+                continue
+        return False
+
+    @property
+    def _should_stop(self) -> bool:
+        return self._stop_event.is_set()
+
+    def _reset_stop(self) -> None:
+        """开始收集时重置停止标志，流式收集由 stream_collection 在启动后台线程前创建，此处不重置"""
+        if not self._streaming:
+            self._stop_event = threading.Event()
 
     def stop_collection(self) -> None:
         """设置停止标志，安全终止收集过程"""
-        self._should_stop = True
+        self._stop_event.set()
+
+    @staticmethod
+    def scan_directory(directory: Path) -> DirectoryScan:
+        """单次遍历目录，返回分类结果及其文件、子目录条目"""
+        return ScanEngine.scan(directory)
 
     @classmethod
     def check_directory_content(cls, directory: Path, mode: Mode = Mode.ALL) -> bool:
         """检查目录内容是否符合指定模式"""
-        if not directory.is_dir():
-            raise ValueError(f"无效的目录路径: {directory}")
-
-        has_files = False
-        has_dirs = False
-
-        for item in directory.iterdir():
-            if item.is_file():
-                has_files = True
-            elif item.is_dir():
-                has_dirs = True
-
-            # 模式冲突立即返回
-            if (mode == Mode.FILE and has_dirs) or (mode == Mode.DIR and has_files):
-                return False
+        scan = cls.scan_directory(directory)
 
         # 根据模式返回结果
         if mode == Mode.ALL:
-            return has_files or has_dirs
-        return (mode == Mode.FILE and has_files) or (mode == Mode.DIR and has_dirs)
+            return scan.has_files or scan.has_dirs
+        return scan.mode == mode
@@ -1,15 +1,25 @@
 import asyncio
+import os
+import re
 import subprocess
+import tempfile
 import threading
 from abc import ABC, abstractmethod
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor
-from typing import List, Union
+from typing import AsyncIterator, Callable, Iterable, List, Optional, Set, Union
 
-from config.unzip_cinfig import log_file
-from src.exceptions.unzip_excepotion import CompressionError, TerminationError, TerminationMESSAGE
+from config.unzip_cinfig import COMPRESSION_PRESETS, INPUT_LIST_THRESHOLD, MASK_LIST_THRESHOLD, STREAM_TAIL_LINES, log_file
+from src.enumerate.unzip_enum import CompressionPreset
+from src.exceptions.unzip_excepotion import CompressionError, ExecutionTimeoutError, TerminationError, \
+    TerminationMESSAGE
+from src.models.ProgressEvent import ProgressEvent
 from src.models.ToolConfig import ToolConfig
 from src.utils.LogDecorator import LogDecorator
 from src.utils.other import OtherTool
+from src.utils.ProgressParser import ProgressParser
+
+_LINE_SPLIT = re.compile(rb"[\r\n\x08]+")
 
 
 class BaseExecutor(ABC):
@@ -18,32 +28,34 @@ class BaseExecutor(ABC):
 
     def __init__(self, max_workers: int = 4):
         self.current_process: Union[subprocess.Popen, asyncio.subprocess.Process, None] = None  # 当前子进程
-        self._manually_terminated = False  # 新增手动终止标记
+        self._processes: Set[Union[subprocess.Popen, asyncio.subprocess.Process]] = set()  # 全部存活的子进程
+        self._terminated_processes: Set[Union[subprocess.Popen, asyncio.subprocess.Process]] = set()  # 被手动终止的子进程
+        self.cancel_requested: Optional[Callable[[], bool]] = None  # 返回 True 时新登记的子进程立即终止
         self._process_lock = threading.Lock()  # 用于保护current_process的线程安全
         self.thread_executor = ThreadPoolExecutor(max_workers=max_workers)  # 线程池
 
     def _run_command(self, command: List[str]) -> str:
         """同步执行命令（支持静默手动终止）"""
+        process = None
         try:
-            with self._process_lock:
-                self._manually_terminated = False  # 重置状态
-                self.current_process = subprocess.Popen(
-                    command,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    encoding="gbk",
-                    errors="replace"
-                )
-
-            stdout, stderr = self.current_process.communicate()
+            process = subprocess.Popen(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                encoding="gbk",
+                errors="replace"
+            )
+            self._register_process(process)
+
+            stdout, stderr = process.communicate()
 
             # 手动终止时跳过错误检查
-            if self._manually_terminated:
+            if process in self._terminated_processes:
                 raise TerminationError("终止")
 
             # 正常错误处理
-            if self.current_process.returncode != 0:
-                error_msg = f"命令执行失败，返回码：{self.current_process.returncode}"
+            if process.returncode != 0:
+                error_msg = f"命令执行失败，返回码：{process.returncode}"
                 if stderr.strip():
                     error_msg += f"\n错误信息：{stderr.strip()}"
                 raise CompressionError(error_msg)
@@ -53,33 +65,65 @@ class BaseExecutor(ABC):
         except FileNotFoundError as e:
             raise CompressionError(f"找不到命令：{command[0]}") from e
         except subprocess.SubprocessError as e:
-            if self._manually_terminated:
+            if process in self._terminated_processes:
                 raise TerminationError("终止")
             else:
                 raise CompressionError("子进程执行错误") from e
         finally:
-            with self._process_lock:
+            self._release_process(process)
+
+    def _register_process(self, process) -> None:
+        """登记子进程，登记时已请求取消则立即终止，避免进程启动前发出的取消被遗漏"""
+        with self._process_lock:
+            self.current_process = process
+            self._processes.add(process)
+            cancelled = self.cancel_requested is not None and self.cancel_requested()
+            if cancelled:
+                self._terminated_processes.add(process)
+        if cancelled:
+            self._terminate(process)
+
+    def _release_process(self, process) -> None:
+        """进程结束后从登记表中移除"""
+        with self._process_lock:
+            self._processes.discard(process)
+            self._terminated_processes.discard(process)
+            if self.current_process is process:
                 self.current_process = None
 
-    async def _async_run_command(self, command: List[str]) -> str:
-        """异步执行命令"""
-        try:
-            with self._process_lock:
-                self._manually_terminated = False  # 重置状态
-                self.current_process = await asyncio.create_subprocess_exec(
-                    *command,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
+    async def _async_run_command(self, command: List[str], timeout: Optional[float] = None) -> str:
+        """
+        异步执行命令，每次调用持有独立的进程句柄，可在同一事件循环中并发执行。
+        超时或所在任务被取消时终止子进程。
 
-            stdout, stderr = await self.current_process.communicate()
+        :param command: 命令列表
+        :param timeout: 超时时间（秒），None 表示不限制
+        """
+        process = None
+        try:
+            # 创建进程需要 await，不能在线程锁内进行，否则会阻塞事件循环
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            self._register_process(process)
+
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+            except asyncio.TimeoutError:
+                await self._async_kill(process)
+                raise ExecutionTimeoutError(f"命令执行超时（{timeout}秒）：{command[0]}")
+            except asyncio.CancelledError:
+                await self._async_kill(process)
+                raise
 
             # 手动终止时跳过错误检查
-            if self._manually_terminated:
+            if process in self._terminated_processes:
                 raise TerminationError("终止")
 
-            if self.current_process.returncode != 0:
-                error_msg = f"命令执行失败，返回码：{self.current_process.returncode}"
+            if process.returncode != 0:
+                error_msg = f"命令执行失败，返回码：{process.returncode}"
                 if stderr:
                     decoded_stderr = stderr.decode('gbk', errors='replace').strip()
                     error_msg += f"\n错误信息：{decoded_stderr}"
@@ -90,13 +134,95 @@ class BaseExecutor(ABC):
         except FileNotFoundError as e:
             raise CompressionError(f"找不到命令：{command[0]}") from e
         except subprocess.SubprocessError as e:
-            if self._manually_terminated:
+            if process in self._terminated_processes:
                 raise TerminationError("终止")
             else:
                 raise CompressionError("子进程执行错误") from e
         finally:
-            with self._process_lock:
-                self.current_process = None
+            self._release_process(process)
+
+    @staticmethod
+    async def _async_kill(process: asyncio.subprocess.Process, grace: float = 1.0) -> None:
+        """先 terminate，宽限期内未退出则 kill，并回收进程"""
+        if process.returncode is not None:
+            return
+        try:
+            process.terminate()
+            try:
+                await asyncio.wait_for(process.wait(), grace)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+        except ProcessLookupError:
+            pass  # 进程已结束无需处理
+
+    def _stream_command(self, command: List[str], on_progress: Optional[Callable[[ProgressEvent], None]] = None,
+                        tail_lines: int = STREAM_TAIL_LINES,
+                        on_start: Optional[Callable[[subprocess.Popen], None]] = None) -> str:
+        """
+        流式执行命令：逐段读取输出并解析为进度事件，只保留最后 tail_lines 行非进度输出用于报错。
+        :param command: 命令列表
+        :param on_progress: 进度回调
+        :param tail_lines: 保留的输出行数
+        :param on_start: 子进程登记后以进程句柄回调，调用方可据此只终止本次执行的进程
+        :return: 保留的输出
+        """
+        process = None
+        tail = deque(maxlen=tail_lines)
+        try:
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+            self._register_process(process)
+            if on_start is not None:
+                on_start(process)
+
+            buffer = b""
+            while True:
+                chunk = process.stdout.read1(8192)
+                if not chunk:
+                    break
+                # 进度通常以 \r 或退格符原地刷新，按三者切分
+                *lines, buffer = _LINE_SPLIT.split(buffer + chunk)
+                for line in lines:
+                    self._handle_output(line, tail, on_progress)
+            self._handle_output(buffer, tail, on_progress)
+            process.wait()
+
+            if process in self._terminated_processes:
+                raise TerminationError("终止")
+
+            if process.returncode != 0:
+                error_msg = f"命令执行失败，返回码：{process.returncode}"
+                if tail:
+                    error_msg += "\n错误信息：" + "\n".join(tail)
+                raise CompressionError(error_msg)
+
+            return "\n".join(tail)
+
+        except FileNotFoundError as e:
+            raise CompressionError(f"找不到命令：{command[0]}") from e
+        except subprocess.SubprocessError as e:
+            if process in self._terminated_processes:
+                raise TerminationError("终止")
+            else:
+                raise CompressionError("子进程执行错误") from e
+        finally:
+            if process is not None and process.stdout is not None:
+                process.stdout.close()
+            self._release_process(process)
+
+    def _handle_output(self, raw: bytes, tail: deque, on_progress: Optional[Callable[[ProgressEvent], None]]) -> None:
+        line = raw.decode("gbk", errors="replace").strip()
+        if not line:
+            return
+        event = self._parse_progress(line)
+        if event is None:
+            tail.append(line)
+        elif on_progress is not None:
+            on_progress(event)
+
+    def _parse_progress(self, line: str) -> Optional[ProgressEvent]:
+        """解析一行输出，子类可按软件的输出格式重写"""
+        return ProgressParser.parse_generic(line)
 
     def _run_in_thread(self, command: List[str]):
         """
@@ -107,25 +233,44 @@ class BaseExecutor(ABC):
         """
         return self.thread_executor.submit(self._run_command, command)
 
+    @property
+    def live_processes(self) -> List[Union[subprocess.Popen, asyncio.subprocess.Process]]:
+        """当前存活的全部子进程"""
+        with self._process_lock:
+            return list(self._processes)
+
     def terminate_process(self):
-        """终止进程并标记为手动终止"""
+        """终止全部存活的进程并标记为手动终止"""
         with self._process_lock:
-            if self.current_process is not None:
+            processes = list(self._processes)
+            self._terminated_processes.update(processes)
+        for process in processes:
+            self._terminate(process)
+
+    def _terminate_handle(self, handle) -> None:
+        """只终止指定的子进程并标记为手动终止，同一工具上并发执行的其它命令不受影响"""
+        with self._process_lock:
+            if handle not in self._processes:
+                return
+            self._terminated_processes.add(handle)
+        self._terminate(handle)
+
+    def _terminate(self, process) -> None:
+        """终止单个进程"""
+        try:
+            if isinstance(process, subprocess.Popen):
+                process.terminate()
                 try:
-                    self._manually_terminated = True  # 标记为手动终止
-                    if isinstance(self.current_process, subprocess.Popen):
-                        self.current_process.terminate()
-                        try:
-                            self.current_process.wait(timeout=1)  # 等待进程结束
-                        except subprocess.TimeoutExpired:
-                            self.current_process.kill()
-                            self.current_process.wait()
-                    elif isinstance(self.current_process, asyncio.subprocess.Process):
-                        self.current_process.terminate()
-                except ProcessLookupError:
-                    pass  # 进程已结束无需处理
-                except Exception as e:
-                    self.log.error(f"终止进程时发生非致命错误：{e}")
+                    process.wait(timeout=1)  # 等待进程结束
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    process.wait()
+            elif isinstance(process, asyncio.subprocess.Process):
+                process.terminate()
+        except ProcessLookupError:
+            pass  # 进程已结束无需处理
+        except Exception as e:
+            self.log.error(f"终止进程时发生非致命错误：{e}")
 
 
 class BaseTool(BaseExecutor, ABC):
@@ -134,6 +279,7 @@ class BaseTool(BaseExecutor, ABC):
     def __init__(self, max_workers: int = 4):
         super().__init__(max_workers)
         self._config = ToolConfig()
+        self._list_files: Set[str] = set()  # 构建命令时生成的列表文件，命令结束后删除
 
     @property
     def config(self) -> ToolConfig:
@@ -162,15 +308,106 @@ class BaseTool(BaseExecutor, ABC):
 
     def execute(self) -> str:
         """同步执行"""
-        return self._run_command(self._build_command())
+        command = self._build_command()
+        try:
+            return self._run_command(command)
+        finally:
+            self._remove_list_files(command)
 
-    async def async_execute(self) -> str:
-        """异步执行"""
-        return await self._async_run_command(self._build_command())
+    async def async_execute(self, timeout: Optional[float] = None) -> str:
+        """异步执行，timeout 为超时时间（秒）"""
+        command = self._build_command()
+        try:
+            return await self._async_run_command(command, timeout)
+        finally:
+            self._remove_list_files(command)
 
     def thread_execute(self):
         """多线程执行"""
-        return self._run_in_thread(self._build_command())
+        command = self._build_command()
+        future = self._run_in_thread(command)
+        future.add_done_callback(lambda _: self._remove_list_files(command))
+        return future
+
+    def _write_list_file(self, lines: Iterable[str]) -> str:
+        """将文件名或通配符逐行写入 UTF-8 临时列表文件，命令执行结束后自动删除"""
+        fd, path = tempfile.mkstemp(prefix="list_", suffix=".lst")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.writelines(f"{line}\n" for line in lines)
+        with self._process_lock:
+            self._list_files.add(path)
+        return path
+
+    def _remove_list_files(self, command: List[str]) -> None:
+        """删除该命令引用的列表文件，同一工具并发执行时互不影响"""
+        with self._process_lock:
+            owned = [path for path in self._list_files if any(path in arg for arg in command)]
+            self._list_files.difference_update(owned)
+        for path in owned:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _progress_switches(self) -> List[str]:
+        """流式执行时追加的进度输出开关，子类按软件重写"""
+        return []
+
+    def execute_stream(self, on_progress: Optional[Callable[[ProgressEvent], None]] = None,
+                       tail_lines: int = STREAM_TAIL_LINES, on_start: Optional[Callable[[object], None]] = None) -> str:
+        """
+        流式执行，执行过程中通过 on_progress 回调进度事件。
+        on_start 在执行开始后以本次执行的句柄回调，可传给 _terminate_handle 只终止本次执行。
+        """
+        command = self._build_command()
+        # 开关放在子命令之后、其余参数之前
+        command = command[:2] + self._progress_switches() + command[2:]
+        try:
+            return self._stream_command(command, on_progress, tail_lines, on_start)
+        finally:
+            self._remove_list_files(command)
+
+    async def aiter_progress(self, tail_lines: int = STREAM_TAIL_LINES) -> AsyncIterator[ProgressEvent]:
+        """
+        以异步迭代器的方式获取进度事件：async for event in tool.aiter_progress()。
+        迭代结束后命令执行完毕，执行失败时抛出异常；提前退出迭代只终止本次执行的子进程并等待其结束。
+        """
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+        handle_lock = threading.Lock()
+        handles: list = []  # 本次执行的句柄
+        stopped = threading.Event()  # 提前退出迭代
+
+        def on_start(handle) -> None:
+            with handle_lock:
+                handles.append(handle)
+            if stopped.is_set():
+                self._terminate_handle(handle)  # 句柄登记前已退出迭代
+
+        future = loop.run_in_executor(
+            self.thread_executor,
+            lambda: self.execute_stream(lambda event: loop.call_soon_threadsafe(events.put_nowait, event),
+                                        tail_lines, on_start)
+        )
+        future.add_done_callback(lambda _: events.put_nowait(None))
+        try:
+            while True:
+                event = await events.get()
+                if event is None:
+                    break
+                yield event
+            await future
+        finally:
+            if not future.done():
+                stopped.set()
+                with handle_lock:
+                    started = list(handles)
+                for handle in started:
+                    await loop.run_in_executor(None, self._terminate_handle, handle)
+                try:
+                    await future
+                except TerminationError:
+                    pass
 
     def __str__(self) -> str:
         return self.__class__.__name__
@@ -179,6 +416,25 @@ class BaseTool(BaseExecutor, ABC):
 class CompressionTool(BaseTool, ABC):
     """压缩工具基类"""
 
+    def set_input_paths(self, input_paths: Iterable[str]) -> 'CompressionTool':
+        """设置多个输入路径，数量超过 INPUT_LIST_THRESHOLD 时通过列表文件传给软件"""
+        self._config.input_path = [str(path) for path in input_paths]
+        return self
+
+    def _input_paths(self) -> List[str]:
+        input_path = self._config.input_path
+        return [str(path) for path in input_path] if isinstance(input_path, list) else [str(input_path)]
+
+    def _input_args(self, listed: Callable[[str], str]) -> List[str]:
+        """
+        将输入路径转换为命令参数，数量超过 INPUT_LIST_THRESHOLD 时写入列表文件。
+        :param listed: 列表文件对应的参数，如 lambda path: "@" + path。
+        """
+        paths = self._input_paths()
+        if len(paths) > INPUT_LIST_THRESHOLD:
+            return [listed(self._write_list_file(paths))]
+        return paths
+
     def set_compression_type(self, compression_type: str) -> 'CompressionTool':
         """设置压缩类型"""
         self._config.compression_type = compression_type
@@ -191,7 +447,70 @@ class CompressionTool(BaseTool, ABC):
         self._config.volume = OtherTool.format_size(volume, self.__class__.__name__)
         return self
 
+    def set_level(self, level: int) -> 'CompressionTool':
+        """设置压缩等级(0-9)，0 为仅存储，各软件按自身范围换算"""
+        if not 0 <= level <= 9:
+            raise ValueError("压缩等级必须在0到9之间")
+        self._config.level = level
+        return self
+
+    def set_threads(self, threads: int) -> 'CompressionTool':
+        """设置压缩线程数"""
+        if threads <= 0:
+            raise ValueError("线程数必须大于0")
+        self._config.threads = threads
+        return self
+
+    def set_dictionary(self, dictionary: str) -> 'CompressionTool':
+        """设置字典大小，如 64m、1g"""
+        self._config.dictionary = dictionary
+        return self
+
+    def set_solid_block(self, solid_block: str) -> 'CompressionTool':
+        """设置固实块大小，如 4g，on 为不限大小，off 为不使用固实压缩"""
+        self._config.solid_block = solid_block
+        return self
+
+    def set_method(self, method: str) -> 'CompressionTool':
+        """设置压缩算法，如 LZMA2、Deflate"""
+        self._config.method = method
+        return self
+
+    def apply_preset(self, preset: Union[CompressionPreset, str]) -> 'CompressionTool':
+        """应用压缩预设，覆盖等级、线程数、字典大小、固实块大小与压缩算法"""
+        settings = COMPRESSION_PRESETS[CompressionPreset(preset).value]
+        for name, value in settings.items():
+            setattr(self._config, name, value)
+        return self
+
 
 class DecompressionTool(BaseTool, ABC):
     """解压工具基类"""
-    pass
+
+    def set_include(self, patterns: Iterable[str]) -> 'DecompressionTool':
+        """只解压匹配的成员，不含路径分隔符的通配符匹配任意目录下的文件名"""
+        self._config.include = list(patterns)
+        return self
+
+    def set_exclude(self, patterns: Iterable[str]) -> 'DecompressionTool':
+        """不解压匹配的成员，匹配规则同 set_include"""
+        self._config.exclude = list(patterns)
+        return self
+
+    @staticmethod
+    def _is_name_pattern(pattern: str) -> bool:
+        """不含路径分隔符的通配符只匹配文件名"""
+        return "/" not in pattern and "\\" not in pattern
+
+    def _pattern_args(self, patterns: List[str], inline: Callable[[str], str],
+                      listed: Callable[[str], str]) -> List[str]:
+        """
+        将通配符转换为命令参数，数量超过 MASK_LIST_THRESHOLD 时写入列表文件。
+        :param inline: 单个通配符对应的参数，如 lambda p: "-x!" + p。
+        :param listed: 列表文件对应的参数，如 lambda path: "-x@" + path。
+        """
+        if not patterns:
+            return []
+        if len(patterns) > MASK_LIST_THRESHOLD:
+            return [listed(self._write_list_file(patterns))]
+        return [inline(pattern) for pattern in patterns]
@@ -11,3 +11,19 @@ class Mode(Enum):
     FILE = auto()
     DIR = auto()
     ALL = auto()
+
+
+class VolumeScheme(Enum):
+    """
+    枚举类，多分卷压缩包的命名方式。
+    - SINGLE: 非分卷文件。
+    - RAR_PART: x.part1.rar / x.part01.rar。
+    - RAR_OLD: x.rar + x.r00、x.r01 ...。
+    - ZIP_SPLIT: x.zip + x.z01、x.z02 ...。
+    - NUMBERED: x.7z.001 / x.zip.001 / x.001 ...。
+    """
+    SINGLE = auto()
+    RAR_PART = auto()
+    RAR_OLD = auto()
+    ZIP_SPLIT = auto()
+    NUMBERED = auto()
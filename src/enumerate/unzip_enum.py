@@ -27,3 +27,31 @@ class BandiZipUnit(Enum):
     KB = "KB"
     MB = "MB"
     GB = "GB"
+
+
+class JobStatus(Enum):
+    """
+    枚举类，解压任务状态。
+    - PENDING: 等待执行。
+    - RUNNING: 执行中。
+    - DONE: 执行成功。
+    - FAILED: 执行失败。
+    - CANCELLED: 已取消。
+    """
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class CompressionPreset(Enum):
+    """
+    枚举类，压缩预设，具体参数见 config.unzip_cinfig.COMPRESSION_PRESETS。
+    - FASTEST: 速度优先。
+    - BALANCED: 兼顾速度与压缩率。
+    - SMALLEST: 压缩率优先。
+    """
+    FASTEST = "fastest"
+    BALANCED = "balanced"
+    SMALLEST = "smallest"
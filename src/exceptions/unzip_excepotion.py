@@ -13,6 +13,14 @@ class CompressionError(Exception):
     """压缩/解压错误"""
 
 
+class ExecutionTimeoutError(CompressionError):
+    """执行超时"""
+
+
+class InsufficientSpaceError(CompressionError):
+    """输出磁盘空间不足"""
+
+
 class NotSoftware(Exception):
     """软件不存在"""
 
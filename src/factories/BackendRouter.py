@@ -0,0 +1,157 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Type, Union
+
+from config.unzip_cinfig import BACKEND_ROUTE_FILE, BACKEND_ROUTES, log_file
+from src.core.interfaces.unzip_interfaces import DecompressionTool
+from src.exceptions.unzip_excepotion import NotSoftware
+from src.factories.JudgementSoftware import CompressionToolFactory, CompressionToolFactorySelector
+from src.utils.LogDecorator import LogDecorator
+
+
+class BackendRouter:
+    """
+    按压缩包类型（FileGather 产出的类型名）选择解压后端。
+    路由表为 {类型: [后端名称, ...]}，依次选择第一个可用的后端；未配置的类型使用默认选择。
+    calibrate() 在样本上实测各后端耗时，将最快的后端排在首位并写入路由文件。
+    """
+    log = LogDecorator(__name__, console=False, logfile=str(log_file))
+
+    def __init__(self, routes: Optional[Dict[str, List[str]]] = None,
+                 route_file: Optional[Union[Path, str]] = BACKEND_ROUTE_FILE):
+        """
+        :param routes: 路由表，默认使用 config.unzip_cinfig.BACKEND_ROUTES。
+        :param route_file: 校准结果文件，存在时覆盖路由表中对应的类型，设为 None 不读写文件。
+        """
+        self.route_file = Path(route_file) if route_file else None
+        self.routes: Dict[str, List[str]] = {key: list(value) for key, value in (routes or BACKEND_ROUTES).items()}
+        self.routes.update(self._load())
+        self._lock = threading.Lock()
+        self._selected: Dict[Tuple[Optional[str], bool], Type[CompressionToolFactory]] = {}
+
+    def factory_for(self, file_type: Optional[str], multi_volume: bool = False) -> CompressionToolFactory:
+        """
+        选择解压后端。
+        :param file_type: 压缩包类型，如 zip / rar / sevenzip / tar / iso / cab。
+        :param multi_volume: 是否为分卷压缩包，为 True 时跳过不支持分卷的后端。
+        """
+        key = (file_type, multi_volume)
+        with self._lock:
+            factory = self._selected.get(key)
+        if factory is None:
+            factory = self._select(file_type, multi_volume)
+            with self._lock:
+                self._selected[key] = factory
+        return factory()
+
+    def decompressor_for(self, file_type: Optional[str], multi_volume: bool = False) -> DecompressionTool:
+        return self.factory_for(file_type, multi_volume).create_decompressor()
+
+    def refresh(self) -> None:
+        """清除已选择的后端，软件安装或卸载后调用"""
+        with self._lock:
+            self._selected.clear()
+
+    def _select(self, file_type: Optional[str], multi_volume: bool) -> Type[CompressionToolFactory]:
+        # 未配置或配置的后端均不可用时，按默认的选择顺序兜底，兜底时同样跳过不支持该类型的后端
+        names = self.routes.get(file_type, []) + [factory.name
+                                                  for factory in CompressionToolFactorySelector._factories]
+        for name in names:
+            factory = self._factory_class(name)
+            if factory is None or not factory.supports(file_type) or (multi_volume and not factory.supports_volumes):
+                continue
+            if factory.is_available():
+                return factory
+        raise NotSoftware(f"No available compression software found for {file_type}.")
+
+    @staticmethod
+    def _factory_class(name: str) -> Optional[Type[CompressionToolFactory]]:
+        for factory in CompressionToolFactorySelector._factories:
+            if factory.name == name:
+                return factory
+        return None
+
+    def calibrate(self, samples: Dict[str, Iterable[Union[Path, str]]], repeats: int = 1,
+                  save: bool = True) -> Dict[str, Dict[str, float]]:
+        """
+        在样本上实测各后端的解压耗时，将最快的后端排在该类型路由的首位。
+        :param samples: {类型: [样本压缩包路径, ...]}。
+        :param repeats: 每个样本重复解压的次数，取总耗时。
+        :param save: 是否写入路由文件。
+        :return: {类型: {后端名称: 总耗时（秒）}}，解压失败的后端不计入。
+        """
+        timings: Dict[str, Dict[str, float]] = {}
+        for file_type, paths in samples.items():
+            paths = [Path(path) for path in paths]
+            candidates = self.routes.get(file_type) or [factory.name for factory in
+                                                        CompressionToolFactorySelector._factories]
+            timings[file_type] = {}
+            for name in candidates:
+                factory = self._factory_class(name)
+                if factory is None or not factory.supports(file_type) or not factory.is_available():
+                    continue
+                elapsed = self._time_backend(factory(), paths, repeats)
+                if elapsed is not None:
+                    timings[file_type][name] = elapsed
+
+            if timings[file_type]:
+                fastest = min(timings[file_type], key=timings[file_type].get)
+                self.routes[file_type] = [fastest] + [name for name in candidates if name != fastest]
+                self.log.info(f"校准 {file_type}: {timings[file_type]}，选择 {fastest}")
+
+        self.refresh()
+        if save:
+            self.save()
+        return timings
+
+    def _time_backend(self, factory: CompressionToolFactory, paths: List[Path], repeats: int) -> Optional[float]:
+        """解压到临时目录并计时，任一样本失败时返回 None"""
+        total = 0.0
+        for path in paths:
+            for _ in range(repeats):
+                output = tempfile.mkdtemp(prefix="calibrate_")
+                tool = factory.create_decompressor()
+                try:
+                    tool.set_input_path(str(path)).set_output_path(output)
+                    start = time.perf_counter()
+                    tool.execute()
+                    total += time.perf_counter() - start
+                except Exception as e:
+                    self.log.warning(f"校准时 {factory.name} 解压失败: {path}, 错误: {e}")
+                    return None
+                finally:
+                    tool.thread_executor.shutdown(wait=False)
+                    shutil.rmtree(output, ignore_errors=True)
+        return total
+
+    def save(self) -> None:
+        if self.route_file is None:
+            return
+        self.route_file.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.route_file.with_name(f"{self.route_file.name}.{os.getpid()}.tmp")
+        temp.write_text(json.dumps(self.routes, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(temp, self.route_file)
+
+    def _load(self) -> Dict[str, List[str]]:
+        if self.route_file is None or not self.route_file.is_file():
+            return {}
+        try:
+            return json.loads(self.route_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            self.log.warning(f"读取路由文件失败，使用默认路由: {e}")
+            return {}
+
+
+if __name__ == '__main__':
+    router = BackendRouter()
+    print(router.calibrate({"zip": [r"E:\样本\a.zip"], "rar": [r"E:\样本\b.rar"]}))
+    for archive_type in ("zip", "rar", "sevenzip"):
+        try:
+            print(archive_type, router.factory_for(archive_type).name)
+        except NotSoftware as error:
+            print(archive_type, error)
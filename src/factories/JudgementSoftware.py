@@ -1,24 +1,42 @@
 import shlex
 import subprocess
 from abc import ABC, abstractmethod
-from typing import List, Type
+from typing import FrozenSet, List, Optional, Tuple, Type
 
 from config.unzip_cinfig import path_test
-from src.core.implement.BandizipCompressor import BandizipCompressor
-from src.core.implement.BandizipDecompressor import BandizipDecompressor
-from src.core.implement.SevenZipCompressor import SevenZipCompressor
-from src.core.implement.SevenZipDecompressor import SevenZipDecompressor
-from src.core.implement.WinRarCompressor import WinRarCompressor
-from src.core.implement.WinRarDecompressor import WinRarDecompressor
+from src.core.implement.unzip.BandizipCompressor import BandizipCompressor
+from src.core.implement.unzip.BandizipDecompressor import BandizipDecompressor
+from src.core.implement.unzip.PythonDecompressor import PythonDecompressor
+from src.core.implement.unzip.SevenZipCompressor import SevenZipCompressor
+from src.core.implement.unzip.SevenZipDecompressor import SevenZipDecompressor
+from src.core.implement.unzip.WinRarCompressor import WinRarCompressor
+from src.core.implement.unzip.WinRarDecompressor import WinRarDecompressor
 from src.core.interfaces.unzip_interfaces import CompressionTool, DecompressionTool
 from src.exceptions.unzip_excepotion import NotSoftware
+from src.models.ToolInfo import ToolInfo
+from src.utils.ToolDetector import ToolDetector
 
 
 class CompressionToolFactory(ABC):
+    name: str = ""  # 后端名称，用于显式选择
+    binaries: Tuple[str, ...] = ()  # 候选可执行文件名
+    probe_args: Tuple[str, ...] = ()  # 探测可用性时传入的参数
+    supports_volumes: bool = True  # 是否支持分卷压缩包
+    formats: Optional[FrozenSet[str]] = None  # 支持解压的压缩包类型（与 COMPRESS 一致），None 表示不限
+
+    @classmethod
+    def supports(cls, file_type: Optional[str]) -> bool:
+        """是否支持解压该类型，类型未知时视为支持"""
+        return cls.formats is None or file_type is None or file_type in cls.formats
+
     @classmethod
-    @abstractmethod
     def is_available(cls) -> bool:
-        pass
+        """通过 ToolDetector 探测，结果按可执行文件路径与 mtime 缓存"""
+        return cls.detect().available
+
+    @classmethod
+    def detect(cls) -> ToolInfo:
+        return ToolDetector.shared().detect(cls.name, cls.binaries, cls.probe_args)
 
     @abstractmethod
     def create_compressor(self) -> CompressionTool:
@@ -30,10 +48,9 @@ class CompressionToolFactory(ABC):
 
 
 class BandizipFactory(CompressionToolFactory):
-    @classmethod
-    def is_available(cls) -> bool:
-        command = f'bandizip t -y "{path_test}"'
-        return JudgementSoftware.judgement(command)["success"]
+    name = "bandizip"
+    binaries = ("bandizip",)
+    probe_args = ("t", "-y", str(path_test))
 
     def create_compressor(self) -> CompressionTool:
         return BandizipCompressor()
@@ -43,10 +60,8 @@ class BandizipFactory(CompressionToolFactory):
 
 
 class SevenZipFactory(CompressionToolFactory):
-    @classmethod
-    def is_available(cls) -> bool:
-        command = "7z"
-        return JudgementSoftware.judgement(command)["success"]
+    name = "7z"
+    binaries = ("7z",)
 
     def create_compressor(self) -> CompressionTool:
         return SevenZipCompressor()
@@ -56,10 +71,8 @@ class SevenZipFactory(CompressionToolFactory):
 
 
 class WinRarFactory(CompressionToolFactory):
-    @classmethod
-    def is_available(cls) -> bool:
-        command = "rar"
-        return JudgementSoftware.judgement(command)["success"]
+    name = "winrar"
+    binaries = ("rar",)
 
     def create_compressor(self) -> CompressionTool:
         return WinRarCompressor()
@@ -68,24 +81,69 @@ class WinRarFactory(CompressionToolFactory):
         return WinRarDecompressor()
 
 
+class PythonFactory(CompressionToolFactory):
+    """进程内解压后端，仅依赖标准库与 py7zr，始终可用，仅支持解压"""
+    name = "python"
+    supports_volumes = False
+    formats = frozenset({"zip", "sevenzip", "tar"})
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return True
+
+    @classmethod
+    def detect(cls) -> ToolInfo:
+        return ToolInfo(name=cls.name, available=True)
+
+    def create_compressor(self) -> CompressionTool:
+        raise NotSoftware("进程内后端仅支持解压")
+
+    def create_decompressor(self) -> DecompressionTool:
+        return PythonDecompressor()
+
+
 class CompressionToolFactorySelector:
     _factories: List[Type[CompressionToolFactory]] = [
         BandizipFactory,
         SevenZipFactory,
-        WinRarFactory
+        WinRarFactory,
+        PythonFactory  # 外部软件均不可用时的兜底
     ]
 
     @classmethod
-    def select_factory(cls) -> CompressionToolFactory:
+    def select_factory(cls, name: Optional[str] = None, file_type: Optional[str] = None) -> CompressionToolFactory:
+        """选择第一个可用的后端，指定 name 时只选择该后端，指定 file_type 时跳过不支持该类型的后端"""
+        if name is not None:
+            return cls.get_factory(name)
         for factory in cls._factories:
-            if factory.is_available():
+            if factory.supports(file_type) and factory.is_available():
                 return factory()
-        raise NotSoftware("No available compression software found.")
+        raise NotSoftware(f"No available compression software found for {file_type}."
+                          if file_type else "No available compression software found.")
+
+    @classmethod
+    def get_factory(cls, name: str) -> CompressionToolFactory:
+        """按名称获取后端，不存在或不可用时抛出 NotSoftware"""
+        for factory in cls._factories:
+            if factory.name == name:
+                if not factory.is_available():
+                    raise NotSoftware(f"{name} is not available.")
+                return factory()
+        raise NotSoftware(f"Unknown compression software: {name}")
 
 
 class JudgementSoftware:
-    def __init__(self):
-        self._factory = CompressionToolFactorySelector.select_factory()
+    def __init__(self, backend: Optional[str] = None, file_type: Optional[str] = None):
+        """
+        :param backend: 指定后端名称（bandizip / 7z / winrar / python），默认自动选择
+        :param file_type: 压缩包类型，自动选择时跳过不支持该类型的后端
+        """
+        self._factory = CompressionToolFactorySelector.select_factory(backend, file_type)
+
+    @staticmethod
+    def refresh() -> None:
+        """清除软件探测缓存，安装或卸载软件后调用"""
+        ToolDetector.shared().refresh()
 
     @staticmethod
     def judgement(command: str) -> dict:
@@ -0,0 +1,22 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+from src.models.ArchiveMember import ArchiveMember
+
+
+@dataclass
+class ArchiveListing:
+    """不解压读取到的压缩包成员列表"""
+    path: Path
+    archive_type: Optional[str] = None
+    members: List[ArchiveMember] = field(default_factory=list)
+
+    @property
+    def total_size(self) -> int:
+        """全部成员解压后的总大小（字节）"""
+        return sum(member.size for member in self.members if not member.is_dir)
+
+    @property
+    def file_count(self) -> int:
+        return sum(1 for member in self.members if not member.is_dir)
@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class ArchiveMember:
+    """压缩包内的单个成员"""
+    path: str
+    size: int = 0  # 解压后大小（字节）
+    packed_size: Optional[int] = None  # 压缩后大小，部分格式无法按成员给出
+    crc: Optional[int] = None
+    mtime: Optional[float] = None  # 修改时间（Unix 时间戳）
+    is_dir: bool = False
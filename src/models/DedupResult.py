@@ -0,0 +1,16 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+Group = List[Tuple[Path, str]]
+
+
+@dataclass
+class DedupResult:
+    """去重结果：unique 为每组相同压缩包的代表，duplicates 记录 代表首卷 -> 重复项首卷"""
+    unique: List[Group] = field(default_factory=list)
+    duplicates: Dict[Path, List[Path]] = field(default_factory=dict)
+
+    @property
+    def duplicate_count(self) -> int:
+        return sum(len(paths) for paths in self.duplicates.values())
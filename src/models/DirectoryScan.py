@@ -0,0 +1,45 @@
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+from src.enumerate.gather_enum import Mode
+
+
+@dataclass
+class DirectoryScan:
+    """单次扫描目录得到的结果，条目保留 os.DirEntry 以复用其缓存的类型信息"""
+    path: Path
+    files: List[os.DirEntry] = field(default_factory=list)
+    dirs: List[os.DirEntry] = field(default_factory=list)
+
+    @property
+    def has_files(self) -> bool:
+        return bool(self.files)
+
+    @property
+    def has_dirs(self) -> bool:
+        return bool(self.dirs)
+
+    @property
+    def mode(self) -> Optional[Mode]:
+        """
+        目录分类。
+        - Mode.DIR: 纯目录。
+        - Mode.FILE: 纯文件。
+        - Mode.ALL: 文件与目录混合。
+        - None: 空目录。
+        """
+        if self.has_files and self.has_dirs:
+            return Mode.ALL
+        if self.has_dirs:
+            return Mode.DIR
+        if self.has_files:
+            return Mode.FILE
+        return None
+
+    def file_paths(self) -> List[Path]:
+        return [Path(entry.path) for entry in self.files]
+
+    def dir_paths(self) -> List[Path]:
+        return [Path(entry.path) for entry in self.dirs]
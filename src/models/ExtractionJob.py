@@ -0,0 +1,47 @@
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+from src.enumerate.unzip_enum import JobStatus
+from src.models.ArchiveListing import ArchiveListing
+
+
+@dataclass
+class ExtractionJob:
+    """单个解压任务，input_path 为分卷集合的首个分卷"""
+    job_id: int
+    input_path: Path
+    output_path: Path
+    file_type: Optional[str] = None
+    volumes: List[Path] = field(default_factory=list)
+    password: Optional[str] = None
+    status: JobStatus = JobStatus.PENDING
+    cancel_requested: bool = False  # 运行中被取消，子进程启动后立即终止
+    result: Optional[str] = None
+    error: Optional[BaseException] = None
+    future: Optional[Future] = field(default=None, repr=False)
+    listing: Optional[ArchiveListing] = field(default=None, repr=False)  # 预检时读取的成员列表
+    required_bytes: int = 0  # 预检估算的解压所需空间（字节）
+    depth: int = 0  # 嵌套层级，0 为直接提交的压缩包
+    parent_id: Optional[int] = None  # 嵌套解压时产出该压缩包的任务
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def elapsed(self) -> Optional[float]:
+        """任务耗时（秒）"""
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    @property
+    def input_size(self) -> int:
+        """全部分卷的总大小（字节）"""
+        total = 0
+        for volume in self.volumes or [self.input_path]:
+            try:
+                total += volume.stat().st_size
+            except OSError:
+                pass
+        return total
@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class ProgressEvent:
+    """压缩/解压进度事件"""
+    percent: Optional[int] = None  # 总进度百分比
+    files_done: Optional[int] = None  # 已处理的文件数
+    bytes_done: Optional[int] = None  # 已处理的字节数
+    current_file: Optional[str] = None  # 正在处理的文件
+    raw: str = ""  # 原始输出行
@@ -1,12 +1,19 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, Union
+from typing import List, Optional, Union
 
 
 @dataclass
 class ToolConfig:
     password: Optional[str] = None
-    input_path: Optional[Union[str, Path]] = None
+    input_path: Optional[Union[str, Path, List[Union[str, Path]]]] = None  # 压缩时可为多个路径
     output_path: Optional[Union[str, Path]] = None
     compression_type: Optional[str] = "7z"
     volume: Optional[str] = None
+    include: List[str] = field(default_factory=list)  # 解压时只包含的成员通配符
+    exclude: List[str] = field(default_factory=list)  # 解压时排除的成员通配符
+    level: Optional[int] = None  # 压缩等级 0-9，None 使用软件默认值
+    threads: Optional[int] = None  # 压缩线程数
+    dictionary: Optional[str] = None  # 字典大小，如 "64m"
+    solid_block: Optional[str] = None  # 固实块大小，如 "4g"，"off" 表示不固实
+    method: Optional[str] = None  # 压缩算法，如 "LZMA2"、"Deflate"
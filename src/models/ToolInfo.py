@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class ToolInfo:
+    """外部压缩软件的探测结果，以解析后的可执行文件路径与修改时间作为缓存键"""
+    name: str
+    path: Optional[str] = None  # 解析符号链接后的可执行文件路径，未找到时为 None
+    mtime_ns: Optional[int] = None
+    available: bool = False
+    version: Optional[str] = None  # 探测输出中的版本号
@@ -0,0 +1,23 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Tuple
+
+from src.enumerate.gather_enum import VolumeScheme
+
+
+@dataclass
+class VolumeSet:
+    """一组同属一个压缩包的分卷，first 为解压时应打开的首个分卷"""
+    key: Tuple
+    scheme: VolumeScheme
+    first: Path
+    volumes: List[Path] = field(default_factory=list)  # 全部分卷，首个分卷在最前
+    missing: List[str] = field(default_factory=list)  # 缺失分卷的文件名
+
+    @property
+    def is_complete(self) -> bool:
+        return not self.missing
+
+    @property
+    def is_multi_volume(self) -> bool:
+        return self.scheme != VolumeScheme.SINGLE
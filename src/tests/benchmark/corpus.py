@@ -0,0 +1,144 @@
+import gzip
+import io
+import random
+import tarfile
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Union
+
+_FIXED_TIME = (2020, 1, 1, 0, 0, 0)
+_WORDS = ["archive", "volume", "gather", "extract", "python", "script", "数据", "文件", "压缩", "解压"]
+
+
+@dataclass
+class Corpus:
+    """生成的基准语料"""
+    root: Path
+    gather_root: Path  # 收集基准使用的目录树
+    samples: Dict[str, List[Path]] = field(default_factory=dict)  # 解压基准使用的样本，按类型分组
+    file_count: int = 0  # gather_root 下的文件数
+    archive_count: int = 0  # gather_root 下的压缩包数（分卷集合计为一个）
+
+
+class SyntheticCorpus:
+    """
+    可复现的合成语料：相同的 seed 与 scale 生成相同的文件（7z 样本的时间戳除外）。
+    收集语料包括大量小压缩包、深层目录、分卷集合与非压缩文件噪声；解压语料包括 zip / tar / 7z 样本。
+    """
+
+    def __init__(self, root: Union[Path, str], seed: int = 0, scale: int = 1, with_7z: bool = True):
+        """
+        :param root: 生成目录。
+        :param seed: 随机种子。
+        :param scale: 规模倍数，文件数与样本大小随之线性增长。
+        :param with_7z: 是否用 py7zr 生成 7z 样本。
+        """
+        self.root = Path(root)
+        self.seed = seed
+        self.scale = scale
+        self.with_7z = with_7z
+        self._rng = random.Random(seed)
+
+    def build(self) -> Corpus:
+        corpus = Corpus(root=self.root, gather_root=self.root / "gather")
+        self._small_archives(corpus, corpus.gather_root / "small")
+        self._deep_tree(corpus, corpus.gather_root / "deep")
+        self._volume_sets(corpus, corpus.gather_root / "volumes")
+        self._noise(corpus, corpus.gather_root / "noise")
+        self._extract_samples(corpus, self.root / "extract")
+        return corpus
+
+    def _payload(self, size: int, compressible: bool = True) -> bytes:
+        """生成指定大小的内容，compressible 为 False 时为随机字节"""
+        if not compressible:
+            return self._rng.randbytes(size)
+        text = " ".join(self._rng.choice(_WORDS) for _ in range(size // 4 + 1)).encode("utf-8")
+        return text[:size]
+
+    def _zip_bytes(self, members: int, member_size: int, compressible: bool = True) -> bytes:
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            for index in range(members):
+                # 固定时间戳，保证相同参数生成的文件逐字节一致
+                info = zipfile.ZipInfo(f"dir{index % 4}/file{index}.txt", date_time=_FIXED_TIME)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                archive.writestr(info, self._payload(member_size, compressible))
+        return buffer.getvalue()
+
+    @staticmethod
+    def _write(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    def _small_archives(self, corpus: Corpus, base: Path) -> None:
+        """大量小压缩包，每个目录 20 个，与少量非压缩文件混放"""
+        for index in range(100 * self.scale):
+            directory = base / f"batch{index // 20}"
+            self._write(directory / f"small{index}.zip", self._zip_bytes(5, self._rng.randint(256, 4096)))
+            corpus.file_count += 1
+            corpus.archive_count += 1
+            if index % 5 == 0:
+                self._write(directory / f"readme{index}.txt", self._payload(512))
+                corpus.file_count += 1
+
+    def _deep_tree(self, corpus: Corpus, base: Path) -> None:
+        """深层目录，仅最深一层存放文件"""
+        for branch in range(2 * self.scale):
+            directory = base / f"branch{branch}"
+            for depth in range(12):
+                directory = directory / f"level{depth}"
+            self._write(directory / "leaf.zip", self._zip_bytes(3, 1024))
+            self._write(directory / "leaf.txt", self._payload(256))
+            corpus.file_count += 2
+            corpus.archive_count += 1
+
+    def _volume_sets(self, corpus: Corpus, base: Path) -> None:
+        """按字节切分的分卷集合（name.zip.001 ...），与 7z 分卷的命名和切分方式一致"""
+        part_size = 64 * 1024
+        for index in range(10 * self.scale):
+            data = self._zip_bytes(4, 48 * 1024, compressible=False)
+            for part, offset in enumerate(range(0, len(data), part_size), start=1):
+                self._write(base / f"set{index}.zip.{part:03d}", data[offset:offset + part_size])
+                corpus.file_count += 1
+            corpus.archive_count += 1
+
+    def _noise(self, corpus: Corpus, base: Path) -> None:
+        """非压缩文件：文本、随机二进制、扩展名与内容不符的文件"""
+        for index in range(50 * self.scale):
+            kind = index % 3
+            if kind == 0:
+                self._write(base / f"note{index}.txt", self._payload(self._rng.randint(64, 8192)))
+            elif kind == 1:
+                self._write(base / f"blob{index}.bin", self._payload(self._rng.randint(64, 8192), compressible=False))
+            else:
+                self._write(base / f"fake{index}.zip", self._payload(1024))
+            corpus.file_count += 1
+
+    def _extract_samples(self, corpus: Corpus, base: Path) -> None:
+        many_small = base / "many_small.zip"
+        self._write(many_small, self._zip_bytes(500 * self.scale, 2048))
+        large = base / "large.zip"
+        self._write(large, self._zip_bytes(4, 2 * 1024 * 1024 * self.scale))
+        corpus.samples["zip"] = [many_small, large]
+
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w") as archive:
+            for index in range(200 * self.scale):
+                data = self._payload(self._rng.randint(512, 16384))
+                info = tarfile.TarInfo(f"dir{index % 8}/file{index}.txt")
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+        tar_path = base / "mixed.tar.gz"
+        self._write(tar_path, gzip.compress(buffer.getvalue(), mtime=0))
+        corpus.samples["tar"] = [tar_path]
+
+        if self.with_7z:
+            # 7z 样本的成员时间戳由 py7zr 写入，文件内容可复现但字节不完全一致
+            import py7zr
+
+            seven_path = base / "mixed.7z"
+            with py7zr.SevenZipFile(seven_path, "w") as archive:
+                for index in range(200 * self.scale):
+                    archive.writestr(self._payload(self._rng.randint(512, 16384)), f"dir{index % 8}/file{index}.txt")
+            corpus.samples["sevenzip"] = [seven_path]
@@ -0,0 +1,185 @@
+"""
+收集与解压的基准测试，结果以 JSON 输出，便于跨提交比较。
+
+用法: python -m src.tests.benchmark.run_benchmark --output bench.json --scale 1 --workers 1,4 --concurrency 1,2,4
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from queue import Queue
+from typing import Dict, List, Optional
+
+from src.core.implement.gather.dir_gather import DirectoryGather
+from src.core.implement.gather.file_gather import FileGather
+from src.core.implement.scheduler.batch_scheduler import BatchScheduler
+from src.enumerate.unzip_enum import JobStatus
+from src.factories.JudgementSoftware import CompressionToolFactorySelector
+from src.tests.benchmark.corpus import Corpus, SyntheticCorpus
+from src.utils.FileTypeCache import FileTypeCache
+
+
+def bench_gather(corpus: Corpus, workers: List[int]) -> List[Dict]:
+    """FileGather / DirectoryGather 的遍历吞吐量，关闭类型缓存以包含识别开销"""
+    results = []
+    runs = [("FileGather", count) for count in workers] + [("DirectoryGather", 1)]
+    for name, count in runs:
+        if name == "FileGather":
+            gatherer = FileGather(Queue(), corpus.gather_root, max_workers=count)
+        else:
+            gatherer = DirectoryGather(Queue(), corpus.gather_root)
+        gatherer.set_type_cache(None)
+        start = time.perf_counter()
+        gatherer.start_collection()
+        items = list(gatherer.get_collection())
+        elapsed = time.perf_counter() - start
+        results.append({
+            "gatherer": name,
+            "workers": count,
+            "seconds": round(elapsed, 6),
+            "items": len(items),
+            "files_per_second": round(corpus.file_count / elapsed, 2) if elapsed else None,
+        })
+    return results
+
+
+def bench_identify(corpus: Corpus) -> Dict:
+    """单文件识别、批量识别与缓存命中时的每文件耗时（微秒）"""
+    paths = sorted(path for path in corpus.gather_root.rglob("*") if path.is_file())
+    gatherer = FileGather(Queue(), corpus.gather_root)
+    gatherer.set_type_cache(None)
+    gatherer.get_magika()  # 模型加载不计入识别耗时
+
+    start = time.perf_counter()
+    for path in paths:
+        gatherer.get_type_name(path)
+    single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    gatherer.get_type_names(paths)
+    batch = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = FileTypeCache(Path(cache_dir) / "bench_cache.sqlite")
+        gatherer.set_type_cache(cache)
+        gatherer.get_type_names(paths)
+        start = time.perf_counter()
+        gatherer.get_type_names(paths)
+        cached = time.perf_counter() - start
+        cache.close()
+
+    count = len(paths) or 1
+    return {
+        "files": len(paths),
+        "single_us_per_file": round(single / count * 1e6, 2),
+        "batch_us_per_file": round(batch / count * 1e6, 2),
+        "cached_us_per_file": round(cached / count * 1e6, 2),
+    }
+
+
+def bench_extract(corpus: Corpus, backends: Optional[List[str]], concurrency: List[int]) -> List[Dict]:
+    """各后端在不同并发数下解压全部样本的吞吐量"""
+    groups = [[(path, file_type)] for file_type, paths in corpus.samples.items() for path in paths]
+    input_bytes = sum(path.stat().st_size for group in groups for path, _ in group)
+    results = []
+    for factory in CompressionToolFactorySelector._factories:
+        if backends is not None and factory.name not in backends:
+            continue
+        if not factory.is_available():
+            results.append({"backend": factory.name, "available": False})
+            continue
+        for jobs in concurrency:
+            output_root = corpus.root / "output" / f"{factory.name}_{jobs}"
+            start = time.perf_counter()
+            with BatchScheduler(output_root, max_jobs=jobs, tool_factory=factory().create_decompressor) as scheduler:
+                scheduler.submit_all(groups)
+                finished = scheduler.wait()
+            elapsed = time.perf_counter() - start
+            failed = [job for job in finished if job.status != JobStatus.DONE]
+            results.append({
+                "backend": factory.name,
+                "available": True,
+                "concurrency": jobs,
+                "seconds": round(elapsed, 6),
+                "archives": len(groups),
+                "failed": [f"{job.input_path.name}: {job.error}" for job in failed],
+                "input_mb_per_second": round(input_bytes / elapsed / 1024 / 1024, 2) if elapsed else None,
+            })
+            shutil.rmtree(output_root, ignore_errors=True)
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        repo_root = Path(__file__).resolve().parents[3]
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=repo_root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (subprocess.SubprocessError, OSError):
+        return None
+
+
+def run(workdir: Path, seed: int, scale: int, workers: List[int], concurrency: List[int],
+        backends: Optional[List[str]], with_7z: bool) -> Dict:
+    corpus_start = time.perf_counter()
+    corpus = SyntheticCorpus(workdir, seed=seed, scale=scale, with_7z=with_7z).build()
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": seed,
+            "scale": scale,
+            "corpus_files": corpus.file_count,
+            "corpus_archives": corpus.archive_count,
+            "corpus_seconds": round(time.perf_counter() - corpus_start, 6),
+        },
+        "gather": bench_gather(corpus, workers),
+        "identify": bench_identify(corpus),
+        "extract": bench_extract(corpus, backends, concurrency),
+    }
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item]
+
+
+def main(argv: Optional[List[str]] = None) -> Dict:
+    parser = argparse.ArgumentParser(description="收集与解压基准测试")
+    parser.add_argument("--output", help="结果 JSON 文件，默认输出到标准输出")
+    parser.add_argument("--workdir", help="语料生成目录，默认使用临时目录并在结束后删除")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--workers", type=_int_list, default=[1, 4], help="FileGather 线程数，逗号分隔")
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 2, 4], help="解压并发数，逗号分隔")
+    parser.add_argument("--backends", help="只测试指定后端，逗号分隔，如 python,7z")
+    parser.add_argument("--no-7z", action="store_true", help="不生成 7z 样本")
+    args = parser.parse_args(argv)
+
+    backends = args.backends.split(",") if args.backends else None
+    if args.workdir:
+        results = run(Path(args.workdir), args.seed, args.scale, args.workers, args.concurrency, backends,
+                      not args.no_7z)
+    else:
+        with tempfile.TemporaryDirectory(prefix="benchmark_") as workdir:
+            results = run(Path(workdir), args.seed, args.scale, args.workers, args.concurrency, backends,
+                          not args.no_7z)
+
+    text = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+    else:
+        print(text)
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+from src.models.ArchiveListing import ArchiveListing
+from src.models.ArchiveMember import ArchiveMember
+
+# 查询结果: (压缩包路径, 成员)
+IndexHit = Tuple[Path, ArchiveMember]
+
+
+class ArchiveIndex:
+    """
+    基于 SQLite 的压缩包内容索引，记录每个压缩包的成员列表。
+    以压缩包路径为键，保存全部分卷的总大小与最新修改时间，二者未变化时无需重新读取。
+    """
+
+    def __init__(self, db_path: Union[Path, str]):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS archive ("
+            "id INTEGER PRIMARY KEY, path TEXT NOT NULL UNIQUE, size INTEGER NOT NULL, "
+            "mtime_ns INTEGER NOT NULL, archive_type TEXT, member_count INTEGER NOT NULL DEFAULT 0, "
+            "total_size INTEGER NOT NULL DEFAULT 0, indexed_at REAL NOT NULL, error TEXT);"
+            "CREATE TABLE IF NOT EXISTS member ("
+            "archive_id INTEGER NOT NULL REFERENCES archive(id) ON DELETE CASCADE, "
+            "path TEXT NOT NULL, name TEXT NOT NULL, size INTEGER NOT NULL, packed_size INTEGER, "
+            "crc INTEGER, mtime REAL, is_dir INTEGER NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS member_archive ON member(archive_id);"
+            "CREATE INDEX IF NOT EXISTS member_name ON member(name);"
+            "CREATE INDEX IF NOT EXISTS member_size ON member(size);"
+        )
+        self._conn.commit()
+
+    def is_current(self, path: Union[Path, str], size: int, mtime_ns: int) -> bool:
+        """压缩包已索引且大小、修改时间未变化"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns FROM archive WHERE path=?", (str(path),)
+            ).fetchone()
+        return row is not None and row[0] == size and row[1] == mtime_ns
+
+    def put(self, listing: ArchiveListing, size: int, mtime_ns: int) -> None:
+        """写入或替换压缩包的成员列表"""
+        with self._lock:
+            archive_id = self._replace_archive(listing.path, size, mtime_ns, listing.archive_type,
+                                               listing.file_count, listing.total_size, None)
+            self._conn.executemany(
+                "INSERT INTO member (archive_id, path, name, size, packed_size, crc, mtime, is_dir) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (archive_id, member.path, member.path.replace("\\", "/").rsplit("/", 1)[-1], member.size,
+                     member.packed_size, member.crc, member.mtime, int(member.is_dir))
+                    for member in listing.members
+                ]
+            )
+            self._conn.commit()
+
+    def put_error(self, path: Union[Path, str], size: int, mtime_ns: int, error: str) -> None:
+        """记录读取失败的压缩包，文件未变化时不再重复尝试"""
+        with self._lock:
+            self._replace_archive(Path(path), size, mtime_ns, None, 0, 0, error)
+            self._conn.commit()
+
+    def _replace_archive(self, path: Path, size: int, mtime_ns: int, archive_type: Optional[str],
+                         member_count: int, total_size: int, error: Optional[str]) -> int:
+        self._conn.execute("DELETE FROM archive WHERE path=?", (str(path),))
+        cursor = self._conn.execute(
+            "INSERT INTO archive (path, size, mtime_ns, archive_type, member_count, total_size, indexed_at, error) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (str(path), size, mtime_ns, archive_type, member_count, total_size, time.time(), error)
+        )
+        return cursor.lastrowid
+
+    def search(self, pattern: Optional[str] = None, name_only: bool = False, min_size: Optional[int] = None,
+               max_size: Optional[int] = None, archive_pattern: Optional[str] = None,
+               include_dirs: bool = False, limit: Optional[int] = None) -> List[IndexHit]:
+        """
+        搜索成员。
+        :param pattern: 通配符（* ? [...]，区分大小写），匹配成员的完整路径。
+        :param name_only: 为 True 时 pattern 只匹配文件名，可使用文件名索引。
+        :param min_size: 最小解压大小（字节）。
+        :param max_size: 最大解压大小（字节）。
+        :param archive_pattern: 按压缩包路径过滤的通配符。
+        :param include_dirs: 是否包含目录成员。
+        :param limit: 最多返回的条数。
+        """
+        conditions, params = [], []
+        if pattern:
+            conditions.append("m.name GLOB ?" if name_only else "m.path GLOB ?")
+            params.append(pattern)
+        if min_size is not None:
+            conditions.append("m.size >= ?")
+            params.append(min_size)
+        if max_size is not None:
+            conditions.append("m.size <= ?")
+            params.append(max_size)
+        if archive_pattern:
+            conditions.append("a.path GLOB ?")
+            params.append(archive_pattern)
+        if not include_dirs:
+            conditions.append("m.is_dir = 0")
+        sql = ("SELECT a.path, m.path, m.size, m.packed_size, m.crc, m.mtime, m.is_dir "
+               "FROM member m JOIN archive a ON a.id = m.archive_id")
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY a.path, m.path"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            (Path(row[0]), ArchiveMember(path=row[1], size=row[2], packed_size=row[3], crc=row[4], mtime=row[5],
+                                         is_dir=bool(row[6])))
+            for row in rows
+        ]
+
+    def archives(self) -> List[Tuple[Path, int, Optional[str]]]:
+        """全部已索引的压缩包: (路径, 成员数, 错误信息)"""
+        with self._lock:
+            rows = self._conn.execute("SELECT path, member_count, error FROM archive ORDER BY path").fetchall()
+        return [(Path(row[0]), row[1], row[2]) for row in rows]
+
+    def remove(self, path: Union[Path, str]) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM archive WHERE path=?", (str(path),))
+            self._conn.commit()
+
+    def prune(self) -> int:
+        """删除文件已不存在的压缩包记录，返回删除的数量"""
+        missing = [path for path, _, _ in self.archives() if not path.exists()]
+        with self._lock:
+            self._conn.executemany("DELETE FROM archive WHERE path=?", [(str(path),) for path in missing])
+            self._conn.commit()
+        return len(missing)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM archive")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,58 @@
+import struct
+from pathlib import Path
+from typing import Optional, Union
+
+# 需要读取的文件头长度，覆盖 ISO9660 位于 0x8001 的卷描述符标识
+HEADER_SIZE = 0x8006
+
+# 以 zip 为容器的文档/程序包，其首个条目名具有固定特征，交给 Magika 判断
+ZIP_CONTAINER_ENTRIES = ("[Content_Types].xml", "mimetype", "AndroidManifest.xml", "classes.dex")
+ZIP_CONTAINER_PREFIXES = ("META-INF/", "_rels/", "word/", "xl/", "ppt/")
+
+
+class FileSignature:
+    """文件头魔数识别，直接将无歧义的压缩格式映射为 config.gather_config.COMPRESS 中的类型名"""
+
+    @staticmethod
+    def sniff(path: Union[Path, str]) -> Optional[str]:
+        """
+        读取一次文件头并识别压缩格式。
+        :param path: 文件路径。
+        :return: 类型名，无法确定时返回 None。
+        """
+        try:
+            with open(path, "rb") as f:
+                header = f.read(HEADER_SIZE)
+        except OSError:
+            return None
+        return FileSignature.sniff_bytes(header)
+
+    @staticmethod
+    def sniff_bytes(header: bytes) -> Optional[str]:
+        """根据文件头字节识别压缩格式"""
+        if header.startswith(b"PK\x03\x04"):
+            return FileSignature._sniff_zip(header)
+        if header.startswith((b"PK\x05\x06", b"PK\x07\x08")):
+            return "zip"
+        if header.startswith(b"7z\xbc\xaf\x27\x1c"):
+            return "sevenzip"
+        if header.startswith((b"Rar!\x1a\x07\x00", b"Rar!\x1a\x07\x01\x00")):
+            return "rar"
+        if header.startswith(b"MSCF\x00\x00\x00\x00"):
+            return "cab"
+        if header[257:262] == b"ustar":
+            return "tar"
+        if header[0x8001:0x8006] == b"CD001":
+            return "iso"
+        return None
+
+    @staticmethod
+    def _sniff_zip(header: bytes) -> Optional[str]:
+        """区分普通 zip 与 docx/jar/apk/epub 等 zip 容器格式"""
+        if len(header) < 30:
+            return None
+        name_length = struct.unpack_from("<H", header, 26)[0]
+        name = header[30:30 + name_length].decode("utf-8", errors="replace")
+        if name in ZIP_CONTAINER_ENTRIES or name.startswith(ZIP_CONTAINER_PREFIXES):
+            return None
+        return "zip"
@@ -0,0 +1,41 @@
+from typing import List, Optional, Tuple
+
+from src.utils.SqliteFileCache import CacheKey, SqliteFileCache
+
+
+class FileTypeCache(SqliteFileCache):
+    """
+    基于 SQLite 的持久化文件类型缓存。
+    以 (device, inode, size, mtime_ns) 作为键，文件内容未变化时直接复用上次的识别结果。
+    """
+    table = "file_type"
+    columns = "label TEXT NOT NULL"
+
+    def get(self, key: CacheKey) -> Optional[str]:
+        return self.get_many([key])[0]
+
+    def get_many(self, keys: List[CacheKey]) -> List[Optional[str]]:
+        """批量查询，未命中或文件已变化的位置为 None"""
+        labels: List[Optional[str]] = []
+        with self._lock:
+            for dev, ino, size, mtime_ns in keys:
+                row = self._conn.execute(
+                    "SELECT size, mtime_ns, label FROM file_type WHERE dev=? AND ino=?", (dev, ino)
+                ).fetchone()
+                labels.append(row[2] if row and row[0] == size and row[1] == mtime_ns else None)
+        return labels
+
+    def put(self, key: CacheKey, label: str) -> None:
+        self.put_many([(key, label)])
+
+    def put_many(self, items: List[Tuple[CacheKey, str]]) -> None:
+        """批量写入，同一 inode 的旧记录会被覆盖"""
+        if not items:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO file_type (dev, ino, size, mtime_ns, label) VALUES (?, ?, ?, ?, ?)",
+                [(*key, label) for key, label in items]
+            )
+            self._added(len(items))
+            self._conn.commit()
@@ -0,0 +1,186 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Set, Tuple
+
+from src.utils.ScanEngine import ScanEngine
+
+# inotify 事件掩码，见 <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class FileWatcher(ABC):
+    """文件变化监听基类，poll 返回自上次调用以来发生变化的文件"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    @abstractmethod
+    def poll(self, timeout: float) -> Set[Path]:
+        """等待最多 timeout 秒，返回新增、被修改或被删除的文件路径"""
+        pass
+
+    def close(self) -> None:
+        pass
+
+    @staticmethod
+    def create(root: Path, use_inotify: bool = True) -> 'FileWatcher':
+        """Linux 下优先使用 inotify，不可用时回退为快照对比轮询"""
+        if use_inotify and InotifyWatcher.is_available():
+            try:
+                return InotifyWatcher(root)
+            except OSError:
+                pass
+        return PollingWatcher(root)
+
+    def _walk_files(self, directory: Path) -> Dict[Path, Tuple[int, int]]:
+        """递归获取目录下全部文件的 (大小, 修改时间)"""
+        files: Dict[Path, Tuple[int, int]] = {}
+        stack = [directory]
+        while stack:
+            try:
+                scan = ScanEngine.scan(stack.pop())
+            except ValueError:
+                continue
+            for entry in scan.files:
+                try:
+                    stat_result = entry.stat()
+                except OSError:
+                    continue
+                files[Path(entry.path)] = (stat_result.st_size, stat_result.st_mtime_ns)
+            stack.extend(Path(entry.path) for entry in scan.dirs)
+        return files
+
+
+class InotifyWatcher(FileWatcher):
+    """基于 inotify 的监听，开销只与变化的文件数有关"""
+    _libc = None
+
+    def __init__(self, root: Path):
+        super().__init__(root)
+        libc = self._load_libc()
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 调用失败")
+        self._watches: Dict[int, Path] = {}
+        self._changed: Set[Path] = set()
+        self._add_tree(self.root)
+
+    @classmethod
+    def is_available(cls) -> bool:
+        if not sys.platform.startswith("linux"):
+            return False
+        try:
+            cls._load_libc()
+            return True
+        except (OSError, AttributeError):
+            return False
+
+    @classmethod
+    def _load_libc(cls):
+        if cls._libc is None:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            libc.inotify_init1.argtypes = [ctypes.c_int]
+            libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+            cls._libc = libc
+        return cls._libc
+
+    def _add_tree(self, directory: Path) -> None:
+        """为目录及其全部子目录添加监听"""
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(current), WATCH_MASK)
+            if wd < 0:
+                continue
+            self._watches[wd] = current
+            try:
+                scan = ScanEngine.scan(current)
+            except ValueError:
+                continue
+            stack.extend(Path(entry.path) for entry in scan.dirs)
+
+    def poll(self, timeout: float) -> Set[Path]:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if readable:
+            self._read_events()
+        changed, self._changed = self._changed, set()
+        return changed
+
+    def _read_events(self) -> None:
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                self._handle_event(wd, mask, os.fsdecode(name))
+
+    def _handle_event(self, wd: int, mask: int, name: str) -> None:
+        if mask & IN_Q_OVERFLOW:
+            # 事件队列溢出，无法得知丢失了哪些事件，全量扫描一次
+            self._changed.update(self._walk_files(self.root))
+            return
+        if mask & IN_IGNORED:
+            self._watches.pop(wd, None)
+            return
+        directory = self._watches.get(wd)
+        if directory is None or not name:
+            return
+        path = directory / name
+        if mask & IN_ISDIR:
+            if mask & (IN_CREATE | IN_MOVED_TO):
+                # 新目录：添加监听，并补录监听建立前已写入的文件
+                self._add_tree(path)
+                self._changed.update(self._walk_files(path))
+            elif mask & (IN_DELETE | IN_MOVED_FROM):
+                # 目录被删除或移走，其下文件不一定逐个产生事件，由调用方按目录前缀处理
+                self._changed.add(path)
+            return
+        self._changed.add(path)
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingWatcher(FileWatcher):
+    """快照对比轮询，适用于不支持 inotify 的平台或网络文件系统"""
+
+    def __init__(self, root: Path):
+        super().__init__(root)
+        self._snapshot = self._walk_files(self.root)
+
+    def poll(self, timeout: float) -> Set[Path]:
+        time.sleep(timeout)
+        snapshot = self._walk_files(self.root)
+        changed = {path for path, state in snapshot.items() if self._snapshot.get(path) != state}
+        changed.update(self._snapshot.keys() - snapshot.keys())  # 被删除的文件
+        self._snapshot = snapshot
+        return changed
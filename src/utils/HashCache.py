@@ -0,0 +1,53 @@
+from typing import Optional
+
+from src.utils.SqliteFileCache import CacheKey, SqliteFileCache
+
+
+class HashCache(SqliteFileCache):
+    """
+    基于 SQLite 的持久化文件哈希缓存。
+    以 (device, inode, size, mtime_ns) 作为键，分别缓存首尾块哈希与全文件哈希。
+    """
+    table = "file_hash"
+    columns = "block_size INTEGER, partial TEXT, full TEXT"
+
+    def _row(self, key: CacheKey):
+        dev, ino, size, mtime_ns = key
+        row = self._conn.execute(
+            "SELECT size, mtime_ns, block_size, partial, full FROM file_hash WHERE dev=? AND ino=?", (dev, ino)
+        ).fetchone()
+        if row is None or row[0] != size or row[1] != mtime_ns:
+            return None
+        return row
+
+    def get_partial(self, key: CacheKey, block_size: int) -> Optional[str]:
+        """获取首尾块哈希，块大小不一致时视为未命中"""
+        with self._lock:
+            row = self._row(key)
+        return row[3] if row and row[2] == block_size else None
+
+    def get_full(self, key: CacheKey) -> Optional[str]:
+        with self._lock:
+            row = self._row(key)
+        return row[4] if row else None
+
+    def put_partial(self, key: CacheKey, block_size: int, digest: str) -> None:
+        with self._lock:
+            row = self._row(key)
+            self._upsert(key, block_size, digest, row[4] if row else None, row is None)
+
+    def put_full(self, key: CacheKey, digest: str) -> None:
+        with self._lock:
+            row = self._row(key)
+            self._upsert(key, row[2] if row else None, row[3] if row else None, digest, row is None)
+
+    def _upsert(self, key: CacheKey, block_size: Optional[int], partial: Optional[str], full: Optional[str],
+                is_new: bool) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO file_hash (dev, ino, size, mtime_ns, block_size, partial, full) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (*key, block_size, partial, full)
+        )
+        if is_new:
+            self._added(1)
+        self._conn.commit()
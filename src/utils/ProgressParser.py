@@ -0,0 +1,34 @@
+import re
+from typing import Optional
+
+from src.models.ProgressEvent import ProgressEvent
+
+# 7z -bsp1 输出，如 " 45% 12 - dir/file.txt" 或 " 3% 1025M"
+_SEVEN_ZIP = re.compile(r"^\s*(?P<percent>\d{1,3})%(?:\s+(?P<count>\d+)(?P<unit>[KMG])?)?(?:\s+[-+U=]\s+(?P<file>.+))?\s*$")
+# WinRAR / Bandizip 控制台输出，如 "Extracting  dir/file.txt     45%" 或退格刷新的 " 46%"
+_GENERIC = re.compile(r"^(?:(?:Extracting|Adding|Updating|解压|压缩)\s+(?P<file>.+?))?\s*(?P<percent>\d{1,3})%\s*(?:OK)?\s*$")
+_UNITS = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+
+class ProgressParser:
+    """将压缩软件的控制台输出解析为进度事件，无法识别时返回 None"""
+
+    @staticmethod
+    def parse_7z(line: str) -> Optional[ProgressEvent]:
+        match = _SEVEN_ZIP.match(line)
+        if not match:
+            return None
+        event = ProgressEvent(percent=int(match["percent"]), current_file=match["file"], raw=line)
+        if match["count"] is not None:
+            if match["unit"]:
+                event.bytes_done = int(match["count"]) * _UNITS[match["unit"]]
+            else:
+                event.files_done = int(match["count"])
+        return event
+
+    @staticmethod
+    def parse_generic(line: str) -> Optional[ProgressEvent]:
+        match = _GENERIC.match(line)
+        if not match:
+            return None
+        return ProgressEvent(percent=int(match["percent"]), current_file=match["file"], raw=line)
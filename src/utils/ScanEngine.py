@@ -0,0 +1,35 @@
+import os
+from pathlib import Path
+from typing import Union
+
+from src.models.DirectoryScan import DirectoryScan
+
+
+class ScanEngine:
+    """基于 os.scandir 的目录遍历引擎，一次遍历完成目录分类和条目收集"""
+
+    @staticmethod
+    def scan(directory: Union[Path, str]) -> DirectoryScan:
+        """
+        扫描目录，按文件/目录归类其直接子条目。
+        :param directory: 目录路径。
+        :return: 扫描结果。
+        :raises ValueError: 路径不是目录或无法读取时抛出。
+        """
+        result = DirectoryScan(Path(directory))
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    # DirEntry 的类型判断优先使用 readdir 返回的缓存信息，避免逐个 stat
+                    try:
+                        if entry.is_file():
+                            result.files.append(entry)
+                        elif entry.is_dir():
+                            result.dirs.append(entry)
+                    except OSError:
+                        continue
+        except (NotADirectoryError, FileNotFoundError):
+            raise ValueError(f"无效的目录路径: {directory}")
+        except OSError as e:
+            raise ValueError(f"无法读取目录: {directory}, 错误: {e}")
+        return result
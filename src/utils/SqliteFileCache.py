@@ -0,0 +1,91 @@
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Tuple, Union
+
+# 缓存键: (设备号, inode, 文件大小, 修改时间纳秒)
+CacheKey = Tuple[int, int, int, int]
+
+
+class SqliteFileCache:
+    """
+    基于 SQLite 的持久化文件缓存基类，以 (device, inode, size, mtime_ns) 作为键，
+    文件内容未变化时复用缓存的值。子类通过 table 与 columns 定义表名和值列，并实现读写方法。
+    """
+    table: str = ""  # 表名
+    columns: str = ""  # 除 dev、ino、size、mtime_ns 以外的列定义
+    _instances: Dict[Tuple[type, str], 'SqliteFileCache'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, db_path: Union[Path, str], max_entries: int = 200_000):
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            "dev INTEGER NOT NULL, ino INTEGER NOT NULL, size INTEGER NOT NULL, "
+            f"mtime_ns INTEGER NOT NULL, {self.columns}, "
+            "PRIMARY KEY (dev, ino))"
+        )
+        self._conn.commit()
+        self._count = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    @classmethod
+    def shared(cls, db_path: Union[Path, str], max_entries: int = 200_000):
+        """按缓存类型与数据库路径获取进程内共享的缓存实例"""
+        key = (cls, str(Path(db_path).resolve()))
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(db_path, max_entries)
+            return cls._instances[key]
+
+    @staticmethod
+    def key_of(stat_result: os.stat_result) -> CacheKey:
+        """由 stat 结果生成缓存键"""
+        return stat_result.st_dev, stat_result.st_ino, stat_result.st_size, stat_result.st_mtime_ns
+
+    def _added(self, count: int) -> None:
+        """记录新增的记录数，超出容量时淘汰旧记录，调用方持有锁并负责提交"""
+        self._count += count
+        if self._count > self.max_entries:
+            self._evict()
+
+    def _evict(self) -> None:
+        """超出容量时按写入顺序淘汰最旧的记录，保留 90% 容量"""
+        self._count = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        overflow = self._count - int(self.max_entries * 0.9)
+        if overflow > 0:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE rowid IN (SELECT rowid FROM {self.table} ORDER BY rowid LIMIT ?)",
+                (overflow,)
+            )
+            self._count -= overflow
+
+    def invalidate(self, path: Union[Path, str]) -> None:
+        """删除指定文件的缓存记录"""
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            return
+        with self._lock:
+            cursor = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE dev=? AND ino=?", (stat_result.st_dev, stat_result.st_ino)
+            )
+            self._count -= cursor.rowcount
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """清空全部缓存"""
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+            self._count = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,132 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Union
+
+from config.unzip_cinfig import TOOL_CACHE_FILE, TOOL_PROBE_TIMEOUT, log_file
+from src.models.ToolInfo import ToolInfo
+from src.utils.LogDecorator import LogDecorator
+
+_VERSION = re.compile(r"(\d+\.\d+(?:\.\d+)?)")
+
+
+class ToolDetector:
+    """
+    压缩软件探测：先用 shutil.which 查找可执行文件，找到后才启动一次进程探测版本与可用性。
+    探测结果按 (解析后的路径, mtime) 缓存在进程内与磁盘上，软件升级或替换后自动重新探测。
+    """
+    log = LogDecorator(__name__, console=False, logfile=str(log_file))
+    _instances: Dict[str, 'ToolDetector'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, cache_file: Optional[Union[Path, str]] = TOOL_CACHE_FILE,
+                 probe_timeout: float = TOOL_PROBE_TIMEOUT):
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.probe_timeout = probe_timeout
+        self._lock = threading.Lock()
+        self._cache: Dict[str, ToolInfo] = self._load()
+
+    @classmethod
+    def shared(cls, cache_file: Optional[Union[Path, str]] = TOOL_CACHE_FILE) -> 'ToolDetector':
+        """按缓存文件获取进程内共享的探测器"""
+        key = str(Path(cache_file).resolve()) if cache_file else ""
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(cache_file)
+            return cls._instances[key]
+
+    def detect(self, name: str, binaries: Sequence[str], probe_args: Sequence[str] = ()) -> ToolInfo:
+        """
+        探测软件。
+        :param name: 软件名称，作为缓存的键。
+        :param binaries: 候选可执行文件名，按顺序取第一个能找到的。
+        :param probe_args: 探测时传入的参数，进程返回码为 0 视为可用。
+        """
+        located = self._locate(binaries)
+        if located is None:
+            return ToolInfo(name=name)  # which 查找很快，未找到的结果不缓存，安装后即可生效
+        path, mtime_ns = located
+
+        with self._lock:
+            cached = self._cache.get(name)
+        if cached is not None and cached.path == path and cached.mtime_ns == mtime_ns:
+            return cached
+
+        info = self._probe(name, path, mtime_ns, probe_args)
+        with self._lock:
+            self._cache[name] = info
+            self._save()
+        return info
+
+    def is_available(self, name: str, binaries: Sequence[str], probe_args: Sequence[str] = ()) -> bool:
+        return self.detect(name, binaries, probe_args).available
+
+    def refresh(self, name: Optional[str] = None) -> None:
+        """清除缓存，下次探测时重新启动进程；name 为 None 时清除全部"""
+        with self._lock:
+            if name is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(name, None)
+            self._save()
+
+    @staticmethod
+    def _locate(binaries: Sequence[str]):
+        """返回 (解析后的路径, mtime_ns)，全部找不到时返回 None"""
+        for binary in binaries:
+            found = shutil.which(binary)
+            if found is None:
+                continue
+            path = os.path.realpath(found)
+            try:
+                return path, os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+        return None
+
+    def _probe(self, name: str, path: str, mtime_ns: int, probe_args: Sequence[str]) -> ToolInfo:
+        try:
+            result = subprocess.run(
+                [path, *probe_args],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                timeout=self.probe_timeout,
+                encoding="gbk",
+                errors="replace"
+            )
+            available = result.returncode == 0
+            match = _VERSION.search(result.stdout or "")
+            version = match.group(1) if match else None
+        except (subprocess.SubprocessError, OSError) as e:
+            self.log.warning(f"探测 {name} 失败: {path}, 错误: {e}")
+            available, version = False, None
+        self.log.info(f"探测 {name}: {path}, 可用: {available}, 版本: {version}")
+        return ToolInfo(name=name, path=path, mtime_ns=mtime_ns, available=available, version=version)
+
+    def _load(self) -> Dict[str, ToolInfo]:
+        if self.cache_file is None or not self.cache_file.is_file():
+            return {}
+        try:
+            data = json.loads(self.cache_file.read_text(encoding="utf-8"))
+            return {name: ToolInfo(**item) for name, item in data.items()}
+        except (OSError, ValueError, TypeError) as e:
+            self.log.warning(f"读取软件探测缓存失败，将重新探测: {e}")
+            return {}
+
+    def _save(self) -> None:
+        """写入临时文件后替换，避免多个进程同时写入时读到不完整的文件"""
+        if self.cache_file is None:
+            return
+        temp = self.cache_file.with_name(f"{self.cache_file.name}.{os.getpid()}.tmp")
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            temp.write_text(json.dumps({name: asdict(info) for name, info in self._cache.items()},
+                                       ensure_ascii=False, indent=2), encoding="utf-8")
+            os.replace(temp, self.cache_file)
+        except OSError as e:
+            self.log.warning(f"写入软件探测缓存失败: {e}")
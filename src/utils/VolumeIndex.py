@@ -0,0 +1,150 @@
+import re
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from config.gather_config import VOLUME_MAX_MISSING
+from src.enumerate.gather_enum import VolumeScheme
+from src.models.VolumeSet import VolumeSet
+
+_RAR_PART = re.compile(r"^(?P<base>.+)\.part(?P<num>\d+)\.rar$", re.IGNORECASE)
+_NUMBERED = re.compile(r"^(?P<base>.+)\.(?P<num>\d{3,})$")
+_ZIP_PART = re.compile(r"^(?P<base>.+)\.z(?P<num>\d{2,})$", re.IGNORECASE)
+_RAR_OLD_PART = re.compile(r"^(?P<base>.+)\.r(?P<num>\d{2,})$", re.IGNORECASE)
+_HEAD = re.compile(r"^(?P<base>.+)\.(?P<ext>zip|rar)$", re.IGNORECASE)
+# x.7z.001 等 .NNN 分卷的前缀应带有压缩包扩展名
+_ARCHIVE_BASE = re.compile(r"\.(zip|7z|rar|tar|gz|tgz|bz2|tbz2|xz|txz|zst|iso|cab|wim)$", re.IGNORECASE)
+
+
+class VolumeIndex:
+    """分卷索引，一次线性遍历将文件按多分卷命名规则归组"""
+
+    @staticmethod
+    def build(paths: Iterable[Path]) -> List[VolumeSet]:
+        """
+        将同一目录下的文件归组为分卷集合，非分卷文件各自成组。
+        :param paths: 文件路径。
+        :return: 分卷集合列表，按首个分卷路径排序。
+        """
+        members: Dict[Tuple, Dict[int, Path]] = {}  # 分卷键: {序号: 路径}
+        heads: Dict[Tuple, Path] = {}  # x.zip / x.rar，可能是分卷首卷也可能是单个压缩包
+        sets: List[VolumeSet] = []
+        numbered: List[Tuple[str, int, Path]] = []  # x.NNN 候选: (前缀, 序号, 路径)
+
+        for path in paths:
+            name = path.name
+            match = _RAR_PART.match(name)
+            if match:
+                VolumeIndex._add(members, (VolumeScheme.RAR_PART, match["base"]), int(match["num"]), path, sets)
+                continue
+            match = _NUMBERED.match(name)
+            if match:
+                numbered.append((match["base"], int(match["num"]), path))
+                continue
+            match = _ZIP_PART.match(name)
+            if match:
+                VolumeIndex._add(members, (VolumeScheme.ZIP_SPLIT, match["base"]), int(match["num"]), path, sets)
+                continue
+            match = _RAR_OLD_PART.match(name)
+            if match:
+                VolumeIndex._add(members, (VolumeScheme.RAR_OLD, match["base"]), int(match["num"]), path, sets)
+                continue
+            match = _HEAD.match(name)
+            if match:
+                scheme = VolumeScheme.ZIP_SPLIT if match["ext"].lower() == "zip" else VolumeScheme.RAR_OLD
+                heads[(scheme, match["base"])] = path
+                continue
+            sets.append(VolumeIndex._single(path))
+
+        # x.NNN 只有前缀带压缩包扩展名或存在 .000 / .001 分卷时才视为分卷，photo.2024 之类的文件各自成组
+        starts = {base for base, index, _ in numbered if index in (0, 1)}
+        for base, index, path in numbered:
+            if _ARCHIVE_BASE.search(base) or base in starts:
+                VolumeIndex._add(members, (VolumeScheme.NUMBERED, base), index, path, sets)
+            else:
+                sets.append(VolumeIndex._single(path))
+
+        # 没有后续分卷的 x.zip / x.rar 是普通压缩包
+        for key, head in heads.items():
+            if key not in members:
+                sets.append(VolumeIndex._single(head))
+
+        for key, parts in members.items():
+            sets.append(VolumeIndex._assemble(key, parts, heads.get(key)))
+
+        sets.sort(key=lambda volume_set: str(volume_set.first))
+        return sets
+
+    @staticmethod
+    def archive_name(volume_set: VolumeSet) -> str:
+        """
+        压缩包名：分卷集合取分卷前缀并去掉压缩包扩展名，单个文件去掉扩展名。
+        backup.20240101 之类不是分卷的数字后缀文件保留完整文件名。
+        """
+        if volume_set.scheme != VolumeScheme.SINGLE:
+            base = Path(volume_set.key[1]).name
+            return _ARCHIVE_BASE.sub("", base) or base
+        name = volume_set.first.name
+        return name if _NUMBERED.match(name) else Path(name).stem
+
+    @staticmethod
+    def _add(members: Dict[Tuple, Dict[int, Path]], key: Tuple, index: int, path: Path,
+             sets: List[VolumeSet]) -> None:
+        """加入分卷组，序号相同的文件（如 part1 与 part01 同时存在）只保留第一个，其余各自成组"""
+        parts = members.setdefault(key, {})
+        if index in parts:
+            sets.append(VolumeIndex._single(path))
+        else:
+            parts[index] = path
+
+    @staticmethod
+    def _single(path: Path) -> VolumeSet:
+        return VolumeSet(key=(VolumeScheme.SINGLE, str(path)), scheme=VolumeScheme.SINGLE, first=path, volumes=[path])
+
+    @staticmethod
+    def _assemble(key: Tuple, parts: Dict[int, Path], head: Optional[Path] = None) -> VolumeSet:
+        """
+        按序号排列分卷并找出缺失的分卷，序号按数值比较，part2 与 part02 属于同一组。
+        缺失的分卷名最多列出 VOLUME_MAX_MISSING 个。
+        """
+        scheme, base = key
+        indexes = sorted(parts)
+        ordered = [parts[index] for index in indexes]
+        directory = ordered[0].parent
+
+        if scheme in (VolumeScheme.RAR_PART, VolumeScheme.NUMBERED):
+            # 从 .000 开始的分卷以 .000 为首卷，缺失分卷按首卷的序号位数补零命名，首卷缺失时使用最小位数
+            start = 0 if 0 in parts else 1
+            pattern, min_width = (_RAR_PART, 1) if scheme == VolumeScheme.RAR_PART else (_NUMBERED, 3)
+            width = len(pattern.match(parts[start].name)["num"]) if start in parts else min_width
+            name_of = (
+                (lambda i: f"{base}.part{i:0{width}d}.rar")
+                if scheme == VolumeScheme.RAR_PART
+                else (lambda i: f"{base}.{i:0{width}d}")
+            )
+            return VolumeSet(
+                key=(scheme, str(directory / base)),
+                scheme=scheme,
+                first=parts.get(start, ordered[0]),
+                volumes=ordered,
+                missing=VolumeIndex._missing(parts, start, indexes[-1], name_of)
+            )
+
+        # x.zip + x.z01... 与 x.rar + x.r00...：解压时打开 x.zip / x.rar
+        start, prefix, head_suffix = (1, "z", "zip") if scheme == VolumeScheme.ZIP_SPLIT else (0, "r", "rar")
+        missing = VolumeIndex._missing(parts, start, indexes[-1], lambda i: f"{base}.{prefix}{i:02d}")
+        if head is None:
+            missing.insert(0, f"{base}.{head_suffix}")
+        return VolumeSet(
+            key=(scheme, str(directory / base)),
+            scheme=scheme,
+            first=head if head is not None else ordered[0],
+            volumes=([head] if head is not None else []) + ordered,
+            missing=missing
+        )
+
+    @staticmethod
+    def _missing(parts: Dict[int, Path], start: int, last: int, name_of: Callable[[int], str]) -> List[str]:
+        """start 至 last 之间缺失的分卷名，找到 VOLUME_MAX_MISSING 个后停止遍历"""
+        gaps = (index for index in range(start, last + 1) if index not in parts)
+        return [name_of(index) for index in islice(gaps, VOLUME_MAX_MISSING)]